@@ -8,11 +8,19 @@ plugins, and utilities for financial institutions worldwide.
 __version__ = "1.0.0"
 __author__ = "Beancount Tools Collection Contributors"
 
-# Make main modules easily accessible
-from . import importers
-from . import prices
-from . import plugins
-from . import scripts
-from . import utils
-
-__all__ = ["importers", "prices", "plugins", "scripts", "utils"] 
\ No newline at end of file
+import importlib
+
+# Main modules are imported lazily on first attribute access (PEP 562)
+__all__ = ["importers", "prices", "plugins", "scripts", "utils"]
+
+
+def __getattr__(name):
+    if name in __all__:
+        module = importlib.import_module(f".{name}", __name__)
+        globals()[name] = module
+        return module
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
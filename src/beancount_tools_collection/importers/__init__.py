@@ -4,55 +4,41 @@ Beancount importers for various financial institutions.
 This module contains importers for Swiss and international financial institutions.
 """
 
-# Import all available importers
+import importlib
 
+# Available importers, imported lazily on first attribute access (PEP 562) so
+# that using one importer does not pull in the dependencies of all the others.
+_SUBMODULES = (
+    'finpension',
+    'ibkr',
+    'revolut',
+    'viac',
+    'viseca',
+    'yuh',
+    'firefly_iii',
+)
 
-try:
-    from . import finpension
-except ImportError:
-    finpension = None
 
-try:
-    from . import ibkr
-except ImportError:
-    ibkr = None
+def __getattr__(name):
+    if name in _SUBMODULES:
+        try:
+            module = importlib.import_module(f".{name}", __name__)
+        except ImportError:
+            module = None
+        globals()[name] = module
+        return module
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-try:
-    from . import revolut
-except ImportError:
-    revolut = None
 
+def __dir__():
+    return sorted(list(globals()) + list(_SUBMODULES))
 
 
-try:
-    from . import viac
-except ImportError:
-    viac = None
-
-try:
-    from . import viseca
-except ImportError:
-    viseca = None
-
-try:
-    from . import yuh
-except ImportError:
-    yuh = None
-
-
-
-try:
-    from . import firefly_iii
-except ImportError:
-    firefly_iii = None
-
-# List of available importers (only those that imported successfully)
-__all__ = [name for name, module in locals().items() 
-           if module is not None and not name.startswith('_')]
+__all__ = list(_SUBMODULES)
 
 # Metadata
 SUPPORTED_INSTITUTIONS = {
     'swiss': ['finpension', 'viac', 'viseca', 'yuh'],
     'international': ['ibkr', 'revolut'],
     'other': ['firefly_iii']
-} 
\ No newline at end of file
+} 
@@ -1,12 +1,36 @@
 import csv
 import logging
-from datetime import timedelta
-from io import StringIO
+import sys
 
 from beancount.core import amount, data
 from beancount.core.number import D
 from beangulp.importer import Importer
-from dateutil.parser import parse
+
+from ..utils.dates import parse_date
+
+
+# columns used from the export, in the order _read_rows yields them
+_COLUMNS = ("amount", "currency_code", "date", "group_id", "Description")
+
+
+def _read_rows(csv_path):
+    # 1 MiB buffer: fewer read() calls than the 8 KiB default on slow/network disks
+    with open(csv_path, newline="", buffering=1 << 20) as csvfile:
+        reader = csv.reader(
+            csvfile,
+            delimiter=",",
+            skipinitialspace=True,
+        )
+
+        # resolve the column positions once instead of per-row dict lookups
+        header = {name: i for i, name in enumerate(next(reader, []))}
+        indices = [header[column] for column in _COLUMNS]
+
+        for row in reader:
+            if len(row) < len(header):
+                logging.warning(f"Skipping incomplete row: {row}")
+                continue
+            yield tuple(row[i] for i in indices)
 
 
 class FireFlyImporter(Importer):
@@ -19,56 +43,64 @@ class FireFlyImporter(Importer):
         return False
 
     def extract(self, filepath, existing=None):
-        entries = dict()
+        # group_id -> (date, narrations, postings); split rows are collected
+        # here and turned into one transaction each once the file is read
+        groups = {}
+        # raw group_id -> Decimal key; the rows of a split share one id
+        d_cache = {}
 
-        with StringIO(filepath.contents()) as csvfile:
-            reader = csv.DictReader(
-                csvfile,
-                delimiter=",",
-                skipinitialspace=True,
-            )
+        # beangulp passes a path, the legacy importer API a file memo with .name
+        csv_path = getattr(filepath, "name", filepath)
+
+        # loop invariants bound to locals for the per-row posting construction
+        account = self.account
+        Posting = data.Posting
+        Amount = amount.Amount
+
+        for row in _read_rows(csv_path):
+            # leading blanks are dropped by skipinitialspace, and both Decimal
+            # and the date parser tolerate trailing ones, so no strip() here
+            raw_amount, currency, raw_date, group_id, description = row
+            if not (raw_amount and raw_date and group_id):
+                logging.warning(f"Skipping row with missing fields: {row}")
+                continue
 
-            for row in reader:
-                try:
-                    amount_raw = D(row["amount"].strip())
-                    amt = amount.Amount(amount_raw, row["currency_code"])
-                    
-                    book_date = parse(row["date"].strip()).date()
-                    tx_id = D(row["group_id"])
-                except Exception as e:
-                    logging.warning(e)
-                    continue
-
-
-                if tx_id in entries: 
-                    # entries[tx_id].postings.append(
-                    #     data.Posting(
-                    #         tx_transfer,
-                    #         amount.Amount(tx_amount, tx_currency),
-                    #         None,
-                    #         None,
-                    #         None,
-                    #         None,
-                    #     )
-                    # )
-                    # entries[tx_id] = entries[tx_id]._replace(
-                    #     narration=(" | ").join(
-                    #         filter(None, (entries[tx_id].narration, tx_narration))
-                    #     )
-                    # )
-                    print("TODO")
-                else:
-                    entry = data.Transaction(
-                        data.new_metadata(filepath, 0, {}),
-                        book_date,
-                        "*",
-                        "",
-                        row["Description"].strip(),
-                        data.EMPTY_SET,
-                        data.EMPTY_SET,
-                        [
-                            data.Posting(self.account, amt, None, None, None, None),
-                            data.Posting(self.account, amt, None, None, None, None),
-                        ],
-                    )
-                    entries.append(entry)
\ No newline at end of file
+            try:
+                # a file has a handful of currencies: share one str per code
+                amt = Amount(D(raw_amount), sys.intern(currency))
+                book_date = parse_date(raw_date)
+                tx_id = d_cache.get(group_id)
+                if tx_id is None:
+                    # numeric key, so "2 " and "2" belong to the same group
+                    tx_id = d_cache[group_id] = D(group_id)
+            except ValueError as e:
+                logging.warning(e)
+                continue
+
+            description = description.strip()
+            # postings are immutable, so a new group reuses one for both legs
+            posting = Posting(account, amt, None, None, None, None)
+            if tx_id in groups:
+                logging.debug("Merging split row into group %s", tx_id)
+                _, narrations, postings = groups[tx_id]
+                narrations.append(description)
+                postings.append(posting)
+            else:
+                groups[tx_id] = (book_date, [description], [posting, posting])
+
+        # every entry carries the same location; copy it so that downstream
+        # tools mutating one entry's meta (e.g. duplicate marking) stay local
+        meta = data.new_metadata(filepath, 0)
+        return [
+            data.Transaction(
+                dict(meta),
+                book_date,
+                "*",
+                "",
+                " | ".join(filter(None, narrations)),
+                data.EMPTY_SET,
+                data.EMPTY_SET,
+                postings,
+            )
+            for book_date, narrations, postings in groups.values()
+        ]
@@ -21,20 +21,26 @@ To obtain these credentials:
 4. The FlexQuery must include: CashReport, Trades, CashTransactions, and CorporateActions
 5. Generate a token for the FlexQuery - this becomes your 'token' value
 6. Note the Query ID - this becomes your 'queryId' value
+
+Offline use:
+Pass fpath="statement.xml" to the IBKRImporter to read a saved FlexQuery XML
+response instead of downloading it (preferred over the legacy pickle files).
 """
 
-import pandas as pd
+from bisect import bisect_right
+from collections import defaultdict
+from functools import lru_cache
 from datetime import datetime, timedelta
-import xml.etree.ElementTree as ET
+import io
 import warnings
 import pickle
 import re
-import numpy as np
 
 import yaml
+import xml.etree.ElementTree as ET
 from os import path
 from ibflex import client, parser, Types
-from ibflex.enums import CashAction, BuySell, Code
+from ibflex.enums import CashAction, BuySell, Code, Reorg
 from ibflex.client import ResponseCodeError
 from beangulp.importer import Importer
 
@@ -63,6 +69,35 @@ _IBKR_CODE_ALIASES: dict[str, list[str]] = {
     "RI": ["I"],
 }
 
+# Patterns applied to IBKR descriptions, e.g.
+# "VTI(US9229087690) CASH DIVIDEND USD 0.80 PER SHARE", "USD CREDIT INT FOR MAR-2023"
+_DIV_RATE_RE = re.compile(r"USD ([\d.]+) PER SHARE")
+_ISIN_RE = re.compile(r"\((.*?)\)")
+_FEE_MONTH_RE = re.compile(r"\w{3} \d{4}")
+_INT_MONTH_RE = re.compile(r"\w{3}-\d{4}")
+# "MSTY SPLIT 1 FOR 5 (MSTY)", forex pairs like "USD.CHF"
+_SPLIT_RE = re.compile(r"SPLIT (\d+) FOR (\d+)")
+_FOREX_RE = re.compile(r"(\w{3})[.](\w{3})")
+
+# quanta for cent-rounded amounts and per-share costs
+_Q2 = Decimal("0.01")
+_Q6 = Decimal("0.000001")
+
+# FlexStatement sections read by the importer; others are not converted
+_FLEX_SECTIONS = frozenset(
+    {"AccountInformation", "CashTransactions", "Trades", "CashReport", "CorporateActions"}
+)
+
+# metadata shared by all trade and balance entries; each entry gets a copy,
+# since beangulp marks duplicates in entry.meta
+_FX_META = data.new_metadata("FX Transaction", 0)
+_BUY_META = data.new_metadata("Buy", 0)
+_BALANCE_META = data.new_metadata("balance", 0)
+
+# cash transaction types handled together
+_DIV_TYPES = frozenset({CashAction.DIVIDEND, CashAction.PAYMENTINLIEU})
+_INT_TYPES = frozenset({CashAction.BROKERINTRCVD, CashAction.BROKERINTPAID})
+
 
 class IBKRImporter(Importer):
     """
@@ -173,25 +208,15 @@ class IBKRImporter(Importer):
 
     def getLiquidityAccount(self, currency):
         # Assets:Invest:IB:USD
-        return ":".join(
-            filter(
-                None,
-                [
-                    self.Mainaccount.replace(self.stockAccountType, self.cashAccountType),
-                    self._account_alias,
-                    currency,
-                ],
-            )
+        return _join_account(
+            self.Mainaccount.replace(self.stockAccountType, self.cashAccountType),
+            self._account_alias,
+            currency,
         )
 
     def getDivIncomeAccount(self, currency, symbol):
         # Income:Dividend:IB:USD
-        return ":".join(
-            filter(
-                None,
-                [self.DivAccount, self._account_alias, currency],
-            )
-        )
+        return _join_account(self.DivAccount, self._account_alias, currency)
 
     def getInterestIncomeAcconut(self, currency):
         # Income:Invest:IB:USD
@@ -200,22 +225,14 @@ class IBKRImporter(Importer):
         if account_parts[0] == "Assets":
             account_parts[0] = "Income"
         income_base = ":".join(account_parts)
-        
-        return ":".join(
-            filter(
-                None,
-                [
-                    income_base,
-                    self._account_alias,
-                    self.interestSuffix,
-                    currency,
-                ],
-            )
+
+        return _join_account(
+            income_base, self._account_alias, self.interestSuffix, currency
         )
 
     def getAssetAccount(self, symbol):
         # Assets:Invest:IB:VTI
-        return ":".join(filter(None, [self.Mainaccount, self._account_alias, symbol]))
+        return _join_account(self.Mainaccount, self._account_alias, symbol)
 
     def getWHTAccount(self):
         # Expenses:Invest:IB
@@ -272,18 +289,15 @@ class IBKRImporter(Importer):
             from beancount.core import inventory
             from beancount.core import realization
             
-            # Create a realization of the accounts
-            real_account = realization.realize(self._existing_entries)
-            
+            # Realize the existing entries once per extract, not per lookup
+            if self._existing_realization is None:
+                self._existing_realization = realization.realize(self._existing_entries)
+
             # Navigate to the specific account
-            account_parts = account.split(':')
-            current = real_account
-            for part in account_parts:
-                if part in current:
-                    current = current[part]
-                else:
-                    logger.info(f"Account {account} not found in existing entries")
-                    return None, None, None
+            current = realization.get(self._existing_realization, account)
+            if current is None:
+                logger.debug("Account {} not found in existing entries", account)
+                return None, None, None
             
             # Get the balance (inventory) for this account
             balance = current.balance
@@ -295,10 +309,13 @@ class IBKRImporter(Importer):
                     if pos.cost and pos.cost.number is not None:
                         total_cost = pos.units.number * pos.cost.number
                         cost_currency = pos.cost.currency
-                        logger.info(f"Found cost basis for {symbol}: {total_units} units, {total_cost} {cost_currency}")
+                        logger.debug(
+                            "Found cost basis for {}: {} units, {} {}",
+                            symbol, total_units, total_cost, cost_currency,
+                        )
                         return total_cost, total_units, cost_currency
             
-            logger.info(f"No position found for {symbol} in {account}")
+            logger.debug("No position found for {} in {}", symbol, account)
             return None, None, None
             
         except Exception as e:
@@ -336,6 +353,7 @@ class IBKRImporter(Importer):
         
         # Store existing entries for cost basis lookup in corporate actions
         self._existing_entries = existing
+        self._existing_realization = None
 
         # get the IBKR creentials ready
         try:
@@ -371,15 +389,26 @@ class IBKRImporter(Importer):
                 # another option would be to try again
                 return []
             assert isinstance(statement, Types.FlexQueryResponse)
+            flex_statements = statement.FlexStatements
         else:
-            print("**** loading from pickle")
-            with open(self.fpath, "rb") as pf:
-                statement = pickle.load(pf)
+            if self.fpath.lower().endswith(".xml"):
+                # a saved FlexQuery response; the sanitizer needs the whole
+                # document, the statements are then parsed one at a time
+                logger.info(f"Loading FlexQuery statement from {self.fpath}")
+                with open(self.fpath, "rb") as xf:
+                    flex_statements = _iter_flex_statements(
+                        self._sanitize_ibkr_xml(xf.read())
+                    )
+            else:
+                print("**** loading from pickle")
+                with open(self.fpath, "rb") as pf:
+                    statement = pickle.load(pf)
+                flex_statements = statement.FlexStatements
 
         all_transactions = []
         
         # Process each FlexStatement
-        for flex_stmt in statement.FlexStatements:
+        for flex_stmt in flex_statements:
             # Get account alias for this statement
             if hasattr(flex_stmt, 'AccountInformation'):
                 raw_alias = flex_stmt.AccountInformation.acctAlias
@@ -389,34 +418,17 @@ class IBKRImporter(Importer):
                 warnings.warn(f"Could not find account alias in FlexStatement for account {flex_stmt.accountId}")
                 self._account_alias = None
 
-            # relevant items from report
-            reports = ["CashReport", "Trades", "CashTransactions", "CorporateActions"]
-            
-            tabs = {
-                report: pd.DataFrame(
-                    [
-                        {key: val for key, val in entry.__dict__.items()}
-                        for entry in flex_stmt.__dict__.get(report, [])
-                    ]
-                )
-                for report in reports
-            }
+            # relevant items from report, as tuples of ibflex dataclasses
+            ct = flex_stmt.CashTransactions
+            tr = flex_stmt.Trades
+            cr = flex_stmt.CashReport
+            ca = flex_stmt.CorporateActions
 
-            # get single dataFrames
-            ct = tabs["CashTransactions"]
-            tr = tabs["Trades"]
-            cr = tabs["CashReport"]
-            ca = tabs["CorporateActions"]
-
-            # throw out IBKR jitter, mostly None
-            ct.drop(columns=[col for col in ct if all(ct[col].isnull())], inplace=True)
-            tr.drop(columns=[col for col in tr if all(tr[col].isnull())], inplace=True)
-            cr.drop(columns=[col for col in cr if all(cr[col].isnull())], inplace=True)
-            ca.drop(columns=[col for col in ca if all(ca[col].isnull())], inplace=True)
-            
             # Process transactions for this statement
-            transactions = self.Trades(tr) + self.CashTransactions(ct) + self.Balances(cr) + self.CorporateActions(ca)
-            all_transactions.extend(transactions)
+            all_transactions.extend(self.Trades(tr))
+            all_transactions.extend(self.CashTransactions(ct))
+            all_transactions.extend(self.Balances(cr))
+            all_transactions.extend(self.CorporateActions(ca))
 
         return all_transactions
 
@@ -425,102 +437,98 @@ class IBKRImporter(Importer):
         This function turns the cash transactions table into beancount transactions
         for dividends, Witholding Tax, Cash deposits (if the flag is set in the
         ConfigIBKR.py) and Interests.
-        arg ct: pandas DataFrame with the according data
+        arg ct: list of ibflex CashTransactions
         returns: list of Beancount transactions
         """
-        if len(ct) == 0:  # catch case of empty dataframe
+        if len(ct) == 0:  # catch case of no cash transactions
             return []
 
-        # First, extract all dividend and WHT entries
-        div_wht = ct[
-            ct["type"].map(
-                lambda t: t == CashAction.DIVIDEND 
-                or t == CashAction.PAYMENTINLIEU 
-                or t == CashAction.WHTAX
-            )
-        ].copy()
+        # bucket the entries by transaction type in a single pass; received
+        # and paid interest share the _INT_TYPES bucket, in statement order
+        by_type = defaultdict(list)
+        for entry in ct:
+            key = _INT_TYPES if entry.type in _INT_TYPES else entry.type
+            by_type[key].append(entry)
+
+        div_wht = (
+            by_type[CashAction.DIVIDEND]
+            + by_type[CashAction.PAYMENTINLIEU]
+            + by_type[CashAction.WHTAX]
+        )
+        dep = by_type[CashAction.DEPOSITWITHDRAW]
+        int_ = by_type[_INT_TYPES]
+        fee = by_type[CashAction.FEES]
 
+        transactions = []
         # Process combined dividend and WHT transactions
-        div_wht_transactions = self.ProcessDividendsAndWHT(div_wht) if not div_wht.empty else []
+        if div_wht:
+            transactions.extend(self.ProcessDividendsAndWHT(div_wht))
 
         # Process other transaction types
-        dep = ct[ct["type"] == CashAction.DEPOSITWITHDRAW].copy()
-        deps = self.Deposits(dep) if len(dep) > 0 else []
-
-        int_ = ct[
-            ct["type"].map(
-                lambda t: t == CashAction.BROKERINTRCVD or t == CashAction.BROKERINTPAID
-            )
-        ].copy()
-        ints = self.Interest(int_) if len(int_) > 0 else []
-
-        fee = ct[ct["type"] == CashAction.FEES].copy()
-        fees = self.Fee(fee) if len(fee) > 0 else []
+        if dep:
+            transactions.extend(self.Deposits(dep))
+        if int_:
+            transactions.extend(self.Interest(int_))
+        if fee:
+            transactions.extend(self.Fee(fee))
 
-        return div_wht_transactions + deps + ints + fees
+        return transactions
 
     def ProcessDividendsAndWHT(self, div_wht):
         """Process Dividend and WHT entries together.
         
         Args:
-            div_wht: DataFrame containing both dividend and WHT entries
+            div_wht: list of ibflex CashTransactions, both dividend and WHT entries
         
         Returns:
             List of beancount transactions
         """
-        if div_wht.empty:
+        if not div_wht:
             return []
 
-        # Extract key information for matching
-        div_wht['div_rate'] = div_wht['description'].apply(
-            lambda d: re.search(r'USD ([\d.]+) PER SHARE', d).group(1) 
-            if re.search(r'USD ([\d.]+) PER SHARE', d) else None
-        )
-        div_wht['isin'] = div_wht['description'].apply(
-            lambda d: re.search(r'\((.*?)\)', d).group(1) 
-            if re.search(r'\((.*?)\)', d) else None
-        )
-        div_wht['is_correction'] = div_wht['description'].str.contains('CORRECTION', case=False)
-
-        # Create a matching key for grouping related entries
-        div_wht['group_key'] = div_wht.apply(
-            lambda row: f"{row['symbol']}_{row['div_rate']}_{row['reportDate']}",
-            axis=1
-        )
+        # Group related entries by symbol, dividend rate and report date
+        # the rate is scanned once per entry and kept with its group
+        groups = defaultdict(list)
+        rates = {}
+        for entry in div_wht:
+            div_rate = _search_group(_DIV_RATE_RE, entry.description)
+            group_key = f"{entry.symbol}_{div_rate}_{entry.reportDate}"
+            groups[group_key].append(entry)
+            rates.setdefault(group_key, div_rate)
 
         transactions = []
         
-        # Group by the matching key to process related entries together
-        for group_key, group in div_wht.groupby('group_key'):
-            if group.empty:
-                continue
-
-            symbol = group.iloc[0]['symbol']
-            date = group.iloc[0]['reportDate']
-            currency = group.iloc[0]['currency']
-            div_rate = group.iloc[0]['div_rate']
-            isin = group.iloc[0]['isin']
+        # Process related entries together, in group key order
+        for group_key, group in sorted(groups.items()):
+            symbol = group[0].symbol
+            date = group[0].reportDate
+            currency = group[0].currency
+            div_rate = rates[group_key]
+            isin = _search_group(_ISIN_RE, group[0].description)
+            is_correction = any("CORRECTION" in row.description.upper() for row in group)
 
             # Separate dividend and WHT entries
-            div_entries = group[group['type'].map(
-                lambda t: t == CashAction.DIVIDEND or t == CashAction.PAYMENTINLIEU
-            )]
-            wht_entries = group[group['type'] == CashAction.WHTAX]
+            div_entries = [
+                row for row in group
+                if row.type in _DIV_TYPES
+            ]
+            wht_entries = [row for row in group if row.type == CashAction.WHTAX]
 
             # Calculate totals
-            total_div = sum(div_entries['amount'])
-            total_wht = sum(wht_entries['amount'])
+            total_div = sum((row.amount for row in div_entries), Decimal(0))
+            total_wht = sum((row.amount for row in wht_entries), Decimal(0))
 
             # Skip if we don't have both dividend and WHT (might be in different reports)
-            if div_entries.empty or wht_entries.empty:
-                logger.info(
-                    f"Incomplete dividend group for {symbol} on {date}: "
-                    f"Dividend entries: {len(div_entries)}, WHT entries: {len(wht_entries)}"
+            if not div_entries or not wht_entries:
+                logger.debug(
+                    "Incomplete dividend group for {} on {}: "
+                    "Dividend entries: {}, WHT entries: {}",
+                    symbol, date, len(div_entries), len(wht_entries),
                 )
                 # Process them individually for now
-                if not div_entries.empty:
+                if div_entries:
                     transactions.extend(self._process_single_dividend(div_entries))
-                if not wht_entries.empty:
+                if wht_entries:
                     transactions.extend(self._process_single_wht(wht_entries))
                 continue
 
@@ -529,9 +537,9 @@ class IBKRImporter(Importer):
                 "symbol": symbol,
                 "isin": isin,
                 "dividend_rate": div_rate,
-                "dividend_entries": "\n".join(div_entries['description'].tolist()),
-                "wht_entries": "\n".join(wht_entries['description'].tolist()),
-                "is_correction": "1" if any(group['is_correction']) else "0",
+                "dividend_entries": "\n".join(row.description for row in div_entries),
+                "wht_entries": "\n".join(row.description for row in wht_entries),
+                "is_correction": "1" if is_correction else "0",
                 "correction_group": group_key
             })
 
@@ -540,13 +548,13 @@ class IBKRImporter(Importer):
                 # Dividend income posting
                 data.Posting(
                     self.getDivIncomeAccount(currency, symbol),
-                    minus(amount.Amount(total_div, currency)),
+                    amount.Amount(-total_div, currency),
                     None, None, None, None
                 ),
                 # WHT posting
                 data.Posting(
                     self.getWHTAccount(),
-                    minus(amount.Amount(total_wht, currency)),
+                    amount.Amount(-total_wht, currency),
                     None, None, None, None
                 ),
                 # Net cash posting
@@ -560,7 +568,7 @@ class IBKRImporter(Importer):
             # Create transaction
             narration = (
                 f"Dividend {symbol} ({div_rate} USD per share)"
-                + (" - Correction" if any(group['is_correction']) else "")
+                + (" - Correction" if is_correction else "")
             )
 
             transactions.append(
@@ -576,9 +584,9 @@ class IBKRImporter(Importer):
                 )
             )
 
-            logger.info(
-                f"Processed dividend group: {date} {symbol} "
-                f"(rate: {div_rate}): {len(group)} entries in single transaction"
+            logger.debug(
+                "Processed dividend group: {} {} (rate: {}): {} entries in single transaction",
+                date, symbol, div_rate, len(group),
             )
 
         return transactions
@@ -586,22 +594,22 @@ class IBKRImporter(Importer):
     def _process_single_dividend(self, div_entries):
         """Process dividend entries that don't have matching WHT entries."""
         transactions = []
-        for _, row in div_entries.iterrows():
-            currency = row["currency"]
-            symbol = row["symbol"]
-            amount_ = amount.Amount(row["amount"], currency)
+        for row in div_entries:
+            currency = row.currency
+            symbol = row.symbol
+            amount_ = amount.Amount(row.amount, currency)
             
             meta = data.new_metadata("dividend", 0, {
                 "symbol": symbol,
-                "isin": row.get('isin'),
-                "original_description": row["description"],
+                "isin": _search_group(_ISIN_RE, row.description),
+                "original_description": row.description,
                 "awaiting_wht": True  # Flag that this might be matched later
             })
 
             postings = [
                 data.Posting(
                     self.getDivIncomeAccount(currency, symbol),
-                    minus(amount_),
+                    amount.Amount(-row.amount, currency),
                     None, None, None, None
                 ),
                 data.Posting(
@@ -614,7 +622,7 @@ class IBKRImporter(Importer):
             transactions.append(
                 data.Transaction(
                     meta,
-                    row["reportDate"],
+                    row.reportDate,
                     self.flag,
                     symbol,
                     f"Dividend {symbol} (awaiting WHT)",
@@ -628,22 +636,22 @@ class IBKRImporter(Importer):
     def _process_single_wht(self, wht_entries):
         """Process WHT entries that don't have matching dividend entries."""
         transactions = []
-        for _, row in wht_entries.iterrows():
-            currency = row["currency"]
-            symbol = row["symbol"]
-            amount_ = amount.Amount(row["amount"], currency)
+        for row in wht_entries:
+            currency = row.currency
+            symbol = row.symbol
+            amount_ = amount.Amount(row.amount, currency)
             
             meta = data.new_metadata("WHT", 0, {
                 "symbol": symbol,
-                "isin": row.get('isin'),
-                "original_description": row["description"],
+                "isin": _search_group(_ISIN_RE, row.description),
+                "original_description": row.description,
                 "awaiting_dividend": True  # Flag that this might be matched later
             })
 
             postings = [
                 data.Posting(
                     self.getWHTAccount(),
-                    minus(amount_),
+                    amount.Amount(-row.amount, currency),
                     None, None, None, None
                 ),
                 data.Posting(
@@ -656,7 +664,7 @@ class IBKRImporter(Importer):
             transactions.append(
                 data.Transaction(
                     meta,
-                    row["reportDate"],
+                    row.reportDate,
                     self.flag,
                     symbol,
                     f"WHT {symbol} (awaiting dividend)",
@@ -670,15 +678,18 @@ class IBKRImporter(Importer):
     def Fee(self, fee):
         # calculates fees from IBKR data
         feeTransactions = []
-        for idx, row in fee.iterrows():
-            currency = row["currency"]
-            amount_ = amount.Amount(row["amount"], currency)
-            text = row["description"]
+        # beangulp may flag duplicates in entry.meta, so each entry gets a copy
+        base_meta = data.new_metadata(__file__, 0, {})  # actually no metadata
+        for row in fee:
+            currency = row.currency
+            amount_ = amount.Amount(row.amount, currency)
+            text = row.description
             month = ""
 
-            try:
-                month = re.findall("\\w{3} \\d{4}", text)[0]
-            except:
+            match = _FEE_MONTH_RE.search(text)
+            if match:
+                month = match.group(0)
+            else:
                 # just ignore
                 warnings.warn(f"No month found in '{text}'")
 
@@ -691,11 +702,10 @@ class IBKRImporter(Importer):
                     self.getLiquidityAccount(currency), amount_, None, None, None, None
                 ),
             ]
-            meta = data.new_metadata(__file__, 0, {})  # actually no metadata
             feeTransactions.append(
                 data.Transaction(
-                    meta,
-                    row["reportDate"],
+                    dict(base_meta),
+                    row.reportDate,
                     self.flag,
                     "IB",  # payee
                     " ".join(["Fee", currency, month]).strip(),
@@ -709,11 +719,12 @@ class IBKRImporter(Importer):
     def Interest(self, int_):
         # calculates interest payments from IBKR data
         intTransactions = []
-        for idx, row in int_.iterrows():
-            currency = row["currency"]
-            amount_ = amount.Amount(row["amount"], currency)
-            text = row["description"]
-            month = re.findall("\\w{3}-\\d{4}", text)[0]
+        base_meta = data.new_metadata("Interest", 0)
+        for row in int_:
+            currency = row.currency
+            amount_ = amount.Amount(row.amount, currency)
+            text = row.description
+            month = _INT_MONTH_RE.findall(text)[0]
 
             # make the postings, two for interest payments
             # received and paid interests are booked on the same account
@@ -730,11 +741,10 @@ class IBKRImporter(Importer):
                     self.getLiquidityAccount(currency), amount_, None, None, None, None
                 ),
             ]
-            meta = data.new_metadata("Interest", 0)
             intTransactions.append(
                 data.Transaction(
-                    meta,  # could add div per share, ISIN,....
-                    row["reportDate"],
+                    dict(base_meta),  # could add div per share, ISIN,....
+                    row.reportDate,
                     self.flag,
                     "IB",  # payee
                     " ".join(["Interest ", currency, month]),
@@ -752,9 +762,10 @@ class IBKRImporter(Importer):
         # assumes you figured out how to deposit/ withdrawal without fees
         if len(self.depositAccount) == 0:  # control this from the config file
             return []
-        for idx, row in dep.iterrows():
-            currency = row["currency"]
-            amount_ = amount.Amount(row["amount"], currency)
+        base_meta = data.new_metadata("deposit/withdrawel", 0)
+        for row in dep:
+            currency = row.currency
+            amount_ = amount.Amount(row.amount, currency)
 
             # make the postings. two for deposits
             postings = [
@@ -763,11 +774,10 @@ class IBKRImporter(Importer):
                     self.getLiquidityAccount(currency), amount_, None, None, None, None
                 ),
             ]
-            meta = data.new_metadata("deposit/withdrawel", 0)
             depTransactions.append(
                 data.Transaction(
-                    meta,  # could add div per share, ISIN,....
-                    row["reportDate"],
+                    dict(base_meta),  # could add div per share, ISIN,....
+                    row.reportDate,
                     self.flag,
                     "self",  # payee
                     "deposit / withdrawal",
@@ -782,200 +792,191 @@ class IBKRImporter(Importer):
         """
         This function turns the IBKR Trades table into beancount transactions
         for Trades
-        arg tr: pandas DataFrame with the according data
+        arg tr: list of ibflex Trades (and closed Lots) in statement order
         returns: list of Beancount transactions
         """
         if len(tr) == 0:  # catch the case of no transactions
             return []
         # forex transactions
-        fx = tr[tr["symbol"].apply(isForex)]
-        # Stocks transactions
-        stocks = tr[~tr["symbol"].apply(isForex)]
+        fx = []
+        # Stocks transactions; keep the statement position to match sales with lots
+        stocks = []
+        for idx, row in enumerate(tr):
+            if isForex(row.symbol):
+                fx.append(row)
+            else:
+                stocks.append((idx, row))
 
-        trTransactions = self.Forex(fx) + self.Stocktrades(stocks)
+        trTransactions = self.Forex(fx)
+        trTransactions.extend(self.Stocktrades(stocks))
 
         return trTransactions
 
     def Forex(self, fx):
         # returns beancount transactions for IBKR forex transactions
-
-        fxTransactions = []
-        for idx, row in fx.iterrows():
-            symbol = row["symbol"]
-            curr_prim, curr_sec = getForexCurrencies(symbol)
-            currency_IBcommision = row["ibCommissionCurrency"]
-            proceeds = amount.Amount(round(row["proceeds"], 2), curr_sec)
-            quantity = amount.Amount(round(row["quantity"], 2), curr_prim)
-            price = amount.Amount(row["tradePrice"], curr_sec)
-            commission = amount.Amount(
-                round(row["ibCommission"], 2), currency_IBcommision
-            )
-            buysell = row["buySell"].name
-
-            cost = position.CostSpec(
-                number_per=None,
-                number_total=None,
-                currency=None,
-                date=None,
-                label=None,
-                merge=False,
-            )
-
-            postings = [
-                data.Posting(
-                    self.getLiquidityAccount(curr_prim),
-                    quantity,
-                    None,
-                    price,
-                    None,
-                    None,
-                ),
-                data.Posting(
-                    self.getLiquidityAccount(curr_sec), proceeds, None, None, None, None
-                ),
-                data.Posting(
-                    self.getLiquidityAccount(currency_IBcommision),
-                    commission,
-                    None,
-                    None,
-                    None,
-                    None,
-                ),
-                data.Posting(
-                    self.getFeesAccount(currency_IBcommision),
-                    minus(commission),
-                    None,
-                    None,
-                    None,
-                    None,
-                ),
-            ]
-
-            fxTransactions.append(
-                data.Transaction(
-                    data.new_metadata("FX Transaction", 0),
-                    row["tradeDate"],
-                    self.flag,
-                    symbol,  # payee
-                    " ".join([buysell, quantity.to_string(), "@", price.to_string()]),
-                    data.EMPTY_SET,
-                    data.EMPTY_SET,
-                    postings,
-                )
-            )
-        return fxTransactions
+        return [self._fxTransaction(row) for row in fx]
+
+    def _fxTransaction(self, row):
+        # one forex trade row -> beancount transaction
+        symbol = row.symbol
+        curr_prim, curr_sec = getForexCurrencies(symbol)
+        currency_IBcommision = row.ibCommissionCurrency
+        proceeds = amount.Amount(row.proceeds.quantize(_Q2), curr_sec)
+        quantity = amount.Amount(row.quantity.quantize(_Q2), curr_prim)
+        price = amount.Amount(row.tradePrice, curr_sec)
+        commission_number = row.ibCommission.quantize(_Q2)
+        commission = amount.Amount(commission_number, currency_IBcommision)
+        fee_amount = amount.Amount(-commission_number, currency_IBcommision)
+        buysell = row.buySell.name
+
+        postings = [
+            data.Posting(
+                self.getLiquidityAccount(curr_prim),
+                quantity,
+                None,
+                price,
+                None,
+                None,
+            ),
+            data.Posting(
+                self.getLiquidityAccount(curr_sec), proceeds, None, None, None, None
+            ),
+            data.Posting(
+                self.getLiquidityAccount(currency_IBcommision),
+                commission,
+                None,
+                None,
+                None,
+                None,
+            ),
+            data.Posting(
+                self.getFeesAccount(currency_IBcommision),
+                fee_amount,
+                None,
+                None,
+                None,
+                None,
+            ),
+        ]
+
+        return data.Transaction(
+            dict(_FX_META),
+            row.tradeDate,
+            self.flag,
+            symbol,  # payee
+            " ".join([buysell, quantity.to_string(), "@", price.to_string()]),
+            data.EMPTY_SET,
+            data.EMPTY_SET,
+            postings,
+        )
 
     def Stocktrades(self, stocks):
         # return the stocks transactions
 
-        stocktrades = stocks[stocks["levelOfDetail"] == "EXECUTION"]  # actual trades
-        buy = stocktrades[
-            (stocktrades["buySell"] == BuySell.BUY)
-            | (  # purchases, including cancelled ones
-                stocktrades["buySell"] == BuySell.CANCELBUY
-            )
-        ]  # and the cancellation transactions to keep balance
-        sale = stocktrades[
-            (stocktrades["buySell"] == BuySell.SELL)
-            | (  # sales, including cancelled ones
-                stocktrades["buySell"] == BuySell.CANCELSELL
-            )
-        ]  # and the cancellation transactions to keep balance
-        # closed lots; keep index to match with sales
-        lots = stocks[stocks["levelOfDetail"] == "CLOSED_LOT"]
-
-        stockTransactions = self.Panic(sale, lots) + self.Shopping(buy)
+        buy, sale, lots = [], [], []
+        for idx, row in stocks:
+            if row.levelOfDetail == "EXECUTION":  # actual trades
+                # purchases and sales, including cancelled ones and the
+                # cancellation transactions to keep balance
+                if row.buySell in (BuySell.BUY, BuySell.CANCELBUY):
+                    buy.append(row)
+                elif row.buySell in (BuySell.SELL, BuySell.CANCELSELL):
+                    sale.append((idx, row))
+            elif row.levelOfDetail == "CLOSED_LOT":
+                # closed lots; keep index to match with sales
+                lots.append((idx, row))
+
+        stockTransactions = self.Panic(sale, lots)
+        stockTransactions.extend(self.Shopping(buy))
 
         return stockTransactions
 
     def Shopping(self, buy):
         # let's go shopping!!
+        return [self._buyTransaction(row) for row in buy]
+
+    def _buyTransaction(self, row):
+        # one buy trade row -> beancount transaction
+        currency = row.currency
+        currency_IBcommision = row.ibCommissionCurrency
+        symbol = row.symbol
+        proceeds = amount.Amount(row.proceeds.quantize(_Q2), currency)
+        commission_number = row.ibCommission.quantize(_Q2)
+        commission = amount.Amount(commission_number, currency_IBcommision)
+        fee_amount = amount.Amount(-commission_number, currency_IBcommision)
+        quantity = amount.Amount(row.quantity, symbol)
+        price = amount.Amount(row.tradePrice, currency)
+
+        cost = position.CostSpec(
+            number_per=price.number,
+            number_total=None,
+            currency=currency,
+            date=row.tradeDate,
+            label=None,
+            merge=False,
+        )
 
-        Shoppingbag = []
-        for idx, row in buy.iterrows():
-            # continue # debugging
-            currency = row["currency"]
-            currency_IBcommision = row["ibCommissionCurrency"]
-            symbol = row["symbol"]
-            proceeds = amount.Amount(row["proceeds"].__round__(2), currency)
-            commission = amount.Amount(
-                (row["ibCommission"].__round__(2)), currency_IBcommision
-            )
-            quantity = amount.Amount(row["quantity"], symbol)
-            price = amount.Amount(row["tradePrice"], currency)
-            text = row["description"]
-
-            number_per = D(row["tradePrice"])
-            currency_cost = currency
-            cost = position.CostSpec(
-                number_per=price.number,
-                number_total=None,
-                currency=currency,
-                date=row["tradeDate"],
-                label=None,
-                merge=False,
-            )
-
-            postings = [
-                data.Posting(
-                    self.getAssetAccount(symbol), quantity, cost, None, None, None
-                ),
-                data.Posting(
-                    self.getLiquidityAccount(currency), proceeds, None, None, None, None
-                ),
-                data.Posting(
-                    self.getLiquidityAccount(currency_IBcommision),
-                    commission,
-                    None,
-                    None,
-                    None,
-                    None,
-                ),
-                data.Posting(
-                    self.getFeesAccount(currency_IBcommision),
-                    minus(commission),
-                    None,
-                    None,
-                    None,
-                    None,
-                ),
-            ]
-
-            tags = frozenset({"drip"}) if Code.REINVESTMENT in row.get("notes", ()) else data.EMPTY_SET
-
-            Shoppingbag.append(
-                data.Transaction(
-                    data.new_metadata("Buy", 0),
-                    row["dateTime"].date(),
-                    self.flag,
-                    symbol,  # payee
-                    " ".join(["BUY", quantity.to_string(), "@", price.to_string()]),
-                    tags,
-                    data.EMPTY_SET,
-                    postings,
-                )
-            )
-        return Shoppingbag
+        postings = [
+            data.Posting(
+                self.getAssetAccount(symbol), quantity, cost, None, None, None
+            ),
+            data.Posting(
+                self.getLiquidityAccount(currency), proceeds, None, None, None, None
+            ),
+            data.Posting(
+                self.getLiquidityAccount(currency_IBcommision),
+                commission,
+                None,
+                None,
+                None,
+                None,
+            ),
+            data.Posting(
+                self.getFeesAccount(currency_IBcommision),
+                fee_amount,
+                None,
+                None,
+                None,
+                None,
+            ),
+        ]
+
+        tags = frozenset({"drip"}) if Code.REINVESTMENT in (row.notes or ()) else data.EMPTY_SET
+
+        return data.Transaction(
+            dict(_BUY_META),
+            row.dateTime.date(),
+            self.flag,
+            symbol,  # payee
+            " ".join(["BUY", quantity.to_string(), "@", price.to_string()]),
+            tags,
+            data.EMPTY_SET,
+            postings,
+        )
 
     def Panic(self, sale, lots):
         # OMG, IT is happening!!
 
         Doom = []
-        for idx, row in sale.iterrows():
+        # closed lots per symbol, in statement order: (positions, lots)
+        lots_by_symbol = defaultdict(lambda: ([], []))
+        for li, clo in lots:
+            positions, symbol_lots = lots_by_symbol[clo.symbol]
+            positions.append(li)
+            symbol_lots.append(clo)
+
+        for idx, row in sale:
             # continue # debugging
-            currency = row["currency"]
-            currency_IBcommision = row["ibCommissionCurrency"]
-            symbol = row["symbol"]
-            proceeds = amount.Amount(row["proceeds"].__round__(2), currency)
-            commission = amount.Amount(
-                (row["ibCommission"].__round__(2)), currency_IBcommision
-            )
-            quantity = amount.Amount(row["quantity"], symbol)
-            price = amount.Amount(row["tradePrice"], currency)
-            text = row["description"]
-            date = row["dateTime"].date()
-            number_per = D(row["tradePrice"])
-            currency_cost = currency
+            currency = row.currency
+            currency_IBcommision = row.ibCommissionCurrency
+            symbol = row.symbol
+            proceeds = amount.Amount(row.proceeds.quantize(_Q2), currency)
+            commission_number = row.ibCommission.quantize(_Q2)
+            commission = amount.Amount(commission_number, currency_IBcommision)
+            fee_amount = amount.Amount(-commission_number, currency_IBcommision)
+            quantity = amount.Amount(row.quantity, symbol)
+            price = amount.Amount(row.tradePrice, currency)
+            date = row.dateTime.date()
 
             # Closed lot rows (potentially multiple) follow sell row
             lotpostings = []
@@ -983,10 +984,12 @@ class IBKRImporter(Importer):
             # mylots: lots closed by sale 'row'
             # symbol must match; begin at the row after the sell row
             # we do not know the number of lot rows; stop iteration if quantity is enough
-            mylots = lots[(lots["symbol"] == row["symbol"]) & (lots.index > idx)]
-            for li, clo in mylots.iterrows():
-                sum_lots_quantity += clo["quantity"]
-                if sum_lots_quantity > -row["quantity"]:
+            positions, symbol_lots = lots_by_symbol.get(row.symbol, ((), ()))
+            mylots = symbol_lots[bisect_right(positions, idx):]
+            asset_account = self.getAssetAccount(symbol)
+            for clo in mylots:
+                sum_lots_quantity += clo.quantity
+                if sum_lots_quantity > -row.quantity:
                     # oops, too many lots (warning issued below)
                     break
 
@@ -994,19 +997,19 @@ class IBKRImporter(Importer):
                     number_per=(
                         Decimal(0)
                         if self.suppressClosedLotPrice
-                        else round(clo["tradePrice"], 2)
+                        else round(clo.tradePrice, 2)
                     ),
                     number_total=None,
-                    currency=clo["currency"],
-                    date=clo["openDateTime"].date(),
+                    currency=clo.currency,
+                    date=clo.openDateTime.date(),
                     label=None,
                     merge=False,
                 )
 
                 lotpostings.append(
                     data.Posting(
-                        self.getAssetAccount(symbol),
-                        amount.Amount(-clo["quantity"], clo["symbol"]),
+                        asset_account,
+                        amount.Amount(-clo.quantity, clo.symbol),
                         cost,
                         price,
                         None,
@@ -1014,12 +1017,12 @@ class IBKRImporter(Importer):
                     )
                 )
 
-                if sum_lots_quantity == -row["quantity"]:
+                if sum_lots_quantity == -row.quantity:
                     # Exact match is expected:
                     # all lots found for this sell transaction
                     break
 
-            if sum_lots_quantity != -row["quantity"]:
+            if sum_lots_quantity != -row.quantity:
                 warnings.warn(f"Lots matching failure: sell index={idx}")
 
             postings = (
@@ -1050,7 +1053,7 @@ class IBKRImporter(Importer):
                     ),
                     data.Posting(
                         self.getFeesAccount(currency_IBcommision),
-                        minus(commission),
+                        fee_amount,
                         None,
                         None,
                         None,
@@ -1061,7 +1064,7 @@ class IBKRImporter(Importer):
 
             Doom.append(
                 data.Transaction(
-                    data.new_metadata("Buy", 0),
+                    dict(_BUY_META),
                     date,
                     self.flag,
                     symbol,  # payee
@@ -1076,55 +1079,53 @@ class IBKRImporter(Importer):
     def Balances(self, cr):
         # generate Balance statements from IBKR Cash reports
         # balances
-        crTransactions = []
-        for idx, row in cr.iterrows():
-            currency = row["currency"]
-            if currency == "BASE_SUMMARY":
-                continue  # this is a summary balance that is not needed for beancount
-            amount_ = amount.Amount(row["endingCash"].__round__(2), currency)
-
-            # make the postings. two for deposits
-            postings = [
-                data.Posting(self.depositAccount, -amount_, None, None, None, None),
-                data.Posting(
-                    self.getLiquidityAccount(currency), amount_, None, None, None, None
-                ),
-            ]
-            meta = data.new_metadata("balance", 0)
-
-            crTransactions.append(
-                data.Balance(
-                    meta,
-                    row["toDate"] + timedelta(days=1),  # see tariochtools EC imp.
-                    self.getLiquidityAccount(currency),
-                    amount_,
-                    None,
-                    None,
-                )
-            )
-        return crTransactions
+        # BASE_SUMMARY is a summary balance that is not needed for beancount
+        return [
+            self._balanceEntry(row) for row in cr if row.currency != "BASE_SUMMARY"
+        ]
+
+    def _balanceEntry(self, row):
+        # one cash report row -> beancount balance assertion
+        currency = row.currency
+        amount_ = amount.Amount(row.endingCash.quantize(_Q2), currency)
+
+        return data.Balance(
+            dict(_BALANCE_META),
+            row.toDate + timedelta(days=1),  # see tariochtools EC imp.
+            self.getLiquidityAccount(currency),
+            amount_,
+            None,
+            None,
+        )
 
     def CorporateActions(self, ca):
         """
         Process corporate actions from IBKR data, including forward and reverse stock splits.
         
         Args:
-            ca: pandas DataFrame with corporate actions data
+            ca: list of ibflex CorporateActions
             
         Returns:
             List of beancount transactions for corporate actions
         """
-        if len(ca) == 0:  # catch case of empty dataframe
+        if len(ca) == 0:  # catch case of no corporate actions
             return []
 
         caTransactions = []
-        
+
+        # split the actions by type in a single pass
+        forward_splits = []
+        reverse_splits = []
+        for row in ca:
+            if row.type == Reorg.FORWARDSPLIT:
+                forward_splits.append(row)
+            elif row.type == Reorg.REVERSESPLIT:
+                reverse_splits.append(row)
+
         # Process forward splits (FS)
-        forward_splits = ca[ca["type"].astype(str).str.contains("FS", case=False, na=False)].copy()
         caTransactions.extend(self._process_forward_splits(forward_splits))
-        
+
         # Process reverse splits (RS)
-        reverse_splits = ca[ca["type"].astype(str).str.contains("RS", case=False, na=False)].copy()
         caTransactions.extend(self._process_reverse_splits(reverse_splits))
         
         return caTransactions
@@ -1134,7 +1135,7 @@ class IBKRImporter(Importer):
         Process forward stock splits from IBKR data.
         
         Args:
-            splits: pandas DataFrame with forward split corporate actions
+            splits: list of ibflex CorporateActions for forward splits
             
         Returns:
             List of beancount transactions for forward splits
@@ -1144,26 +1145,20 @@ class IBKRImporter(Importer):
 
         transactions = []
         
-        for idx, row in splits.iterrows():
-            symbol = row["symbol"]
-            currency = row["currency"]
-            split_quantity = amount.Amount(D(str(row["quantity"])), symbol)
-            date = row["dateTime"].date() if hasattr(row["dateTime"], 'date') else row["reportDate"]
+        for row in splits:
+            symbol = row.symbol
+            currency = row.currency
+            split_quantity = amount.Amount(D(str(row.quantity)), symbol)
+            date = _action_date(row)
             
             # Extract split ratio from description (e.g., "SPLIT 4 FOR 1")
-            description = row["actionDescription"]
-            split_match = re.search(r'SPLIT (\d+) FOR (\d+)', description)
-            if split_match:
-                new_shares = split_match.group(1)
-                old_shares = split_match.group(2)
-                split_ratio = f"{new_shares}:{old_shares}"
-            else:
-                split_ratio = "unknown"
+            description = row.actionDescription
+            split_ratio = _split_ratio(description)
             
             # Create metadata
             meta = data.new_metadata("stock_split", 0, {
                 "symbol": symbol,
-                "isin": row.get("isin", ""),
+                "isin": getattr(row, "isin", None) or "",
                 "split_ratio": split_ratio,
                 "split_type": "forward",
                 "split_description": description,
@@ -1209,8 +1204,13 @@ class IBKRImporter(Importer):
                 )
             )
             
-            logger.info(f"Processed forward stock split: {date} {symbol} {split_ratio} (+{split_quantity})")
-        
+            logger.debug(
+                "Processed forward stock split: {} {} {} (+{})",
+                date, symbol, split_ratio, split_quantity,
+            )
+
+        if transactions:
+            logger.info(f"Processed {len(transactions)} forward stock split(s)")
         return transactions
 
     def _process_reverse_splits(self, splits):
@@ -1226,7 +1226,7 @@ class IBKRImporter(Importer):
         2. If actionID is not available (e.g., in ibflex), group by dateTime + underlyingSymbol + type
         
         Args:
-            splits: pandas DataFrame with reverse split corporate actions
+            splits: list of ibflex CorporateActions for reverse splits
             
         Returns:
             List of beancount transactions for reverse splits
@@ -1238,73 +1238,75 @@ class IBKRImporter(Importer):
         
         # Group by actionID or fallback to dateTime + underlyingSymbol + type
         # This is an alternative to actionID which may not be available in ibflex
-        grouping_columns = []
-        if "actionID" in splits.columns:
-            grouping_columns = ["actionID"]
+        use_action_id = any(getattr(row, "actionID", None) is not None for row in splits)
+        if use_action_id:
             logger.debug("Using actionID for reverse split grouping")
         else:
             # Fallback grouping when actionID is not available
             # Use underlyingSymbol instead of symbol because the symbol changes in splits
             # but underlyingSymbol stays the same for paired entries
-            grouping_columns = ["dateTime", "underlyingSymbol", "type"]
             logger.debug("actionID not available, using dateTime+underlyingSymbol+type for reverse split grouping")
-        
-        for group_key, group in splits.groupby(grouping_columns):
-            # Identify removal (negative qty) and addition (positive qty) entries
-            removal = group[group["quantity"] < 0]
-            addition = group[group["quantity"] > 0]
-            
-            if removal.empty or addition.empty:
+
+        # group_key -> (removal entries, addition entries), split by sign on the way
+        groups = {}
+        for row in splits:
+            if use_action_id:
+                group_key = row.actionID
+            else:
+                group_key = (row.dateTime, row.underlyingSymbol, row.type)
+            if group_key is None or (isinstance(group_key, tuple) and None in group_key):
+                continue  # entries without a complete key cannot be paired
+            removal, addition = groups.setdefault(group_key, ([], []))
+            # removal: negative qty, addition: positive qty
+            if row.quantity < 0:
+                removal.append(row)
+            elif row.quantity > 0:
+                addition.append(row)
+
+        # cost basis per (account, symbol); the existing entries do not change
+        cost_bases = {}
+        for group_key, (removal, addition) in groups.items():
+
+            if not removal or not addition:
                 group_desc = group_key if isinstance(group_key, (str, int)) else str(group_key)
                 logger.warning(f"Incomplete reverse split pair for group {group_desc}")
                 continue
             
             # Extract data from both entries
-            removal_row = removal.iloc[0]
-            addition_row = addition.iloc[0]
+            removal_row = removal[0]
+            addition_row = addition[0]
             
-            old_symbol = removal_row["symbol"]
-            new_symbol = addition_row["symbol"]
-            old_qty = abs(removal_row["quantity"])
-            new_qty = addition_row["quantity"]
-            currency = addition_row["currency"]
+            old_symbol = removal_row.symbol
+            new_symbol = addition_row.symbol
+            old_qty = abs(removal_row.quantity)
+            new_qty = addition_row.quantity
+            currency = addition_row.currency
             
-            # Parse date - handle both dateTime formats
-            date_value = addition_row["dateTime"]
-            if hasattr(date_value, 'date'):
-                date = date_value.date()
-            elif isinstance(date_value, str) and ";" in date_value:
-                # Handle format like "20251205;202500"
-                date = datetime.strptime(date_value.split(";")[0], "%Y%m%d").date()
-            else:
-                date = addition_row["reportDate"]
+            date = _action_date(addition_row)
             
             # Extract split ratio from description (e.g., "SPLIT 1 FOR 5")
-            description = addition_row["actionDescription"]
-            split_match = re.search(r'SPLIT (\d+) FOR (\d+)', description)
-            if split_match:
-                new_shares = split_match.group(1)
-                old_shares = split_match.group(2)
-                split_ratio = f"{new_shares}:{old_shares}"
-            else:
-                split_ratio = "unknown"
+            description = addition_row.actionDescription
+            split_ratio = _split_ratio(description)
             
             # Try to get cost basis from existing entries
             asset_account = self.getAssetAccount(new_symbol)
-            total_cost, total_units, cost_currency = self._get_cost_basis_from_existing(
-                asset_account, new_symbol
-            )
+            cost_key = (asset_account, new_symbol)
+            if cost_key not in cost_bases:
+                cost_bases[cost_key] = self._get_cost_basis_from_existing(
+                    asset_account, new_symbol
+                )
+            total_cost, total_units, cost_currency = cost_bases[cost_key]
             
             # Calculate new per-share cost if we found the original cost basis
             cost_basis_found = total_cost is not None and total_units is not None
             if cost_basis_found and total_cost is not None:
                 # Transfer the total cost basis to the new shares
-                new_cost_per_share = D(str(round(total_cost / D(str(new_qty)), 6)))
+                new_cost_per_share = (total_cost / new_qty).quantize(_Q6)
                 cost_currency = cost_currency or currency
                 narration_suffix = ""
-                logger.info(
-                    f"Cost basis lookup successful: {total_cost} {cost_currency} / {new_qty} = "
-                    f"{new_cost_per_share} {cost_currency} per share"
+                logger.debug(
+                    "Cost basis lookup successful: {} {} / {} = {} {} per share",
+                    total_cost, cost_currency, new_qty, new_cost_per_share, cost_currency,
                 )
             else:
                 # Fallback to zero cost with warning
@@ -1320,14 +1322,14 @@ class IBKRImporter(Importer):
             meta_dict = {
                 "symbol": new_symbol,
                 "old_symbol": old_symbol,
-                "isin": addition_row.get("isin", ""),
+                "isin": getattr(addition_row, "isin", None) or "",
                 "split_ratio": split_ratio,
                 "split_type": "reverse",
                 "split_description": description,
             }
             
             # Add actionID to metadata if available, otherwise use group key info
-            if "actionID" in splits.columns:
+            if use_action_id:
                 meta_dict["actionID"] = str(group_key)
             else:
                 meta_dict["group_key"] = str(group_key)
@@ -1395,11 +1397,14 @@ class IBKRImporter(Importer):
                 )
             )
             
-            logger.info(
-                f"Processed reverse stock split: {date} {new_symbol} "
-                f"({split_ratio}): -{old_qty} -> +{new_qty} @ {new_cost_per_share} {cost_currency}"
+            logger.debug(
+                "Processed reverse stock split: {} {} ({}): -{} -> +{} @ {} {}",
+                date, new_symbol, split_ratio, old_qty, new_qty,
+                new_cost_per_share, cost_currency,
             )
-        
+
+        if transactions:
+            logger.info(f"Processed {len(transactions)} reverse stock split(s)")
         return transactions
 
 
@@ -1412,19 +1417,17 @@ def CollapseTradeSplits(tr):
     pass
 
 
+@lru_cache(maxsize=4096)
 def isForex(symbol):
     # retruns True if a transaction is a forex transaction.
-    b = re.search("(\\w{3})[.](\\w{3})", symbol)  # find something lile "USD.CHF"
-    if b is None:  # no forex transaction, rather a normal stock transaction
-        return False
-    else:
-        return True
+    # find something lile "USD.CHF"; otherwise a normal stock transaction
+    return _FOREX_RE.search(symbol) is not None
 
 
+@lru_cache(maxsize=4096)
 def getForexCurrencies(symbol):
-    b = re.search("(\\w{3})[.](\\w{3})", symbol)
-    c = b.groups()
-    return [c[0], c[1]]
+    # ("USD", "CHF") for "USD.CHF"; a tuple, since the result is cached
+    return _FOREX_RE.search(symbol).groups()
 
 
 class InvalidFormatError(Exception):
@@ -1447,6 +1450,54 @@ def DecimalOrZero(value):
         return Decimal(0.0)
 
 
+@lru_cache(maxsize=None)
+def _join_account(*components):
+    # account names are built from few distinct parts (alias, currency, symbol)
+    # but requested for every posting, so the joined names are memoized
+    return ":".join(filter(None, components))
+
+
+def _iter_flex_statements(source):
+    """Parse FlexQuery XML bytes incrementally, yielding one FlexStatement at a time.
+
+    The source bytes are held in memory by the caller. Only the sections in
+    _FLEX_SECTIONS are converted to ibflex dataclasses and each statement
+    element is cleared once converted, so the parsed element tree and the
+    dataclasses never cover more than one statement.
+    """
+    for _, elem in ET.iterparse(io.BytesIO(source), events=("end",)):
+        if elem.tag != "FlexStatement":
+            continue
+        for child in list(elem):
+            if child.tag not in _FLEX_SECTIONS:
+                elem.remove(child)
+        yield parser.parse_data_element(elem)
+        elem.clear()
+
+
+def _action_date(row):
+    # ibflex parses dateTime to a datetime; raw "20251205;202500" strings and
+    # missing values are handled for older pickled statements
+    date_value = row.dateTime
+    if isinstance(date_value, datetime):
+        return date_value.date()
+    if isinstance(date_value, str) and ";" in date_value:
+        return datetime.strptime(date_value.split(";")[0], "%Y%m%d").date()
+    return row.reportDate
+
+
+def _split_ratio(description):
+    # "SPLIT 10 FOR 1" -> "10:1"
+    match = _SPLIT_RE.search(description)
+    return ":".join(match.groups()) if match else "unknown"
+
+
+def _search_group(pattern, text):
+    # first group of a pattern match in text, None if it does not match
+    match = pattern.search(text)
+    return match.group(1) if match else None
+
+
 def AmountAdd(A1, A2):
     # add two amounts
     if A1.currency == A2.currency:
@@ -8,7 +8,11 @@ import re
 from beancount.core import amount, data
 from beancount.core.number import D
 from beangulp.importer import Importer
-from dateutil.parser import parse
+
+from ..utils.dates import parse_date
+
+# column positions in the Revolut export
+_COMPLETED_DATE, _DESCRIPTION, _AMOUNT, _CURRENCY, _BALANCE = 3, 4, 5, 7, 9
 
 
 class RevolutImporter(Importer):
@@ -34,49 +38,21 @@ class RevolutImporter(Importer):
 
         with open(filepath, encoding='utf-8-sig') as csvfile:
             logger.debug(f"Successfully opened file {filepath}")
-            reader = csv.DictReader(
-                csvfile,
-                [
-                    "Type",
-                    "Product",
-                    "Started Date",
-                    "Completed Date",
-                    "Description",
-                    "Amount",
-                    "Fee",
-                    "Currency",
-                    "State",
-                    "Balance",
-                ],
-                delimiter=",",
-                skipinitialspace=True,
-            )
-            logger.debug("Created CSV DictReader with headers")
+            reader = csv.reader(csvfile, delimiter=",", skipinitialspace=True)
+            logger.debug("Created CSV reader")
             next(reader)  # Skip header row
             logger.debug("Skipped header row")
             
             row_count = 0
             for row in reader:
                 row_count += 1
-                logger.debug(f"Processing row {row_count}: {row}")
                 try:
-                    logger.debug(f"Raw Balance: {row['Balance']}")
-                    bal = D(row["Balance"].replace("'", "").strip())
-                    logger.debug(f"Parsed Balance: {bal}")
-                    
-                    logger.debug(f"Raw Amount: {row['Amount']}")
-                    amount_raw = D(row["Amount"].replace("'", "").strip())
-                    logger.debug(f"Parsed Amount: {amount_raw}")
-                    
-                    amt = amount.Amount(amount_raw, row["Currency"])
-                    logger.debug(f"Created Amount object: {amt}")
-                    
+                    bal = D(row[_BALANCE].replace("'", "").strip())
+                    amount_raw = D(row[_AMOUNT].replace("'", "").strip())
+                    amt = amount.Amount(amount_raw, row[_CURRENCY])
                     balance = amount.Amount(bal, self.currency)
-                    logger.debug(f"Created Balance object: {balance}")
-                    
-                    logger.debug(f"Raw Completed Date: {row['Completed Date']}")
-                    book_date = parse(row["Completed Date"].strip()).date()
-                    logger.debug(f"Parsed date: {book_date}")
+                    book_date = parse_date(row[_COMPLETED_DATE].strip())
+                    description = row[_DESCRIPTION].strip()
                 except Exception as e:
                     logger.error(f"Error processing row {row_count}: {e}")
                     logger.error(f"Problematic row data: {row}")
@@ -86,7 +62,7 @@ class RevolutImporter(Importer):
                     data.new_metadata(filepath, 0, {}),
                     book_date,
                     "*",
-                    row["Description"].strip(),
+                    description,
                     "",
                     data.EMPTY_SET,
                     data.EMPTY_SET,
@@ -94,7 +70,6 @@ class RevolutImporter(Importer):
                         data.Posting(self.main_account, amt, None, None, None, None),
                     ],
                 )
-                logger.debug(f"Created transaction entry: {entry}")
                 entries.append(entry)
 
             logger.info(f"Processed {row_count} rows successfully")
@@ -7,9 +7,10 @@ Download the request and pass the resulting file to this importer.
 ### https://app.viac.ch/files/document/21V-KOM-JHE
 
 
-import json
-import pandas as pd
+import codecs
+import os
 import re
+from functools import lru_cache
 from loguru import logger
 from datetime import datetime, timedelta
 
@@ -17,6 +18,85 @@ from beangulp.importer import Importer
 from beancount.core.number import Decimal
 from beancount.core import data, amount, position
 
+from ..utils.jsonfile import load_json
+
+try:
+    import ijson
+except ImportError:  # optional, large exports are then loaded at once
+    ijson = None
+
+# exports above this size are streamed account by account when ijson is available
+_STREAM_MIN_BYTES = 16 << 20
+
+
+def _iter_accounts(filepath):
+    """Yield (account key, transactions) pairs from a Viac export.
+
+    Large exports are streamed with ijson so that only one account's
+    transactions are held in memory; numbers are read as floats, like
+    the json parsers return them.
+    """
+    if ijson is not None and os.path.getsize(filepath) >= _STREAM_MIN_BYTES:
+        with open(filepath, "rb") as data_file:
+            # yajl rejects a UTF-8 BOM, so skip it as load_json does
+            start = 0
+            if data_file.read(len(codecs.BOM_UTF8)) == codecs.BOM_UTF8:
+                start = len(codecs.BOM_UTF8)
+            data_file.seek(start)
+
+            empty = True
+            for item in ijson.kvitems(data_file, "transactions", use_float=True):
+                empty = False
+                yield item
+            if empty:
+                # an export without a "transactions" key fails with a KeyError,
+                # like the loaded branch; an empty map yields nothing in both
+                data_file.seek(start)
+                if not any(
+                    prefix == "" and event == "map_key" and value == "transactions"
+                    for prefix, event, value in ijson.parse(data_file)
+                ):
+                    raise KeyError("transactions")
+    else:
+        yield from load_json(filepath)["transactions"].items()
+
+
+# pillar and portfolio parts of the account names rewritten in fix_accounts
+_PILLAR_RE = re.compile(r"S[2,3]a?")
+_PORTFOLIO_RE = re.compile(r"Portfolio\d|Freizuegigkeit|Ueberobligatorium")
+
+# Viac transaction type -> handler bucket; other types are ignored
+_TYPE_BUCKETS = {
+    "INTEREST": "INTEREST",
+    "FEE_CHARGE": "FEE_CHARGE",
+    "CONTRIBUTION": "CONTRIBUTION",
+    "TRADE_SELL": "TRADE",
+    "TRADE_BUY": "TRADE",
+    "DIVIDEND": "DIVIDEND",
+    "DIVIDEND_CANCELLATION": "DIVIDEND",
+}
+
+_VIAC_DOC_URL = "https://app.viac.ch/files/document/"
+
+# precision of transaction amounts and booked balances
+_Q4 = Decimal("0.0001")
+_Q3 = Decimal("0.001")
+
+
+@lru_cache(maxsize=None)
+def _account_roots(main_account):
+    # (income root, expenses root) for an Assets:... account
+    return (
+        main_account.replace("Assets", "Income"),
+        main_account.replace("Assets", "Expenses"),
+    )
+
+
+@lru_cache(maxsize=None)
+def _join_account(*components):
+    # account names are requested for every posting, so the joins are memoized
+    return ":".join(components)
+
 
 class ViacImporter(Importer):
     """
@@ -51,6 +131,7 @@ class ViacImporter(Importer):
         self.share_lookup = share_lookup
         self.file_encoding = file_encoding
         self.regex = regex
+        self._regex_re = re.compile(regex, re.IGNORECASE)
         self.flag = "*"
         # Default account mapping that can be overridden
         self.account_map = {
@@ -73,10 +154,11 @@ class ViacImporter(Importer):
         # Override with custom mapping if provided
         if account_map:
             self.account_map.update(account_map)
+        self._build_s2_flat()
 
     def identify(self, filepath):
         # intended file format is *viac_*
-        result = bool(re.search(self.regex, filepath, re.IGNORECASE))
+        result = bool(self._regex_re.search(filepath))
         logger.info(
             f"identify assertion for viac importer and file '{filepath}': {result}"
         )
@@ -106,26 +188,36 @@ class ViacImporter(Importer):
             return None
             
         account_type = self._get_s2_account_type(source_account)
-        
-        # Handle nested mappings (like Interest and Fees) vs direct mappings
-        if category in ['Interest', 'Fees']:
-            return self.account_map.get('S2', {}).get(category, {}).get(account_type)
-        else:
-            return self.account_map.get('S2', {}).get(account_type)
+        key = (category if category in ('Interest', 'Fees') else '', account_type)
+        return self._s2_flat.get(key)
+
+    def _build_s2_flat(self):
+        """Flatten the S2 account map to {(category, account_type): account}.
+
+        Direct mappings use the category ''; nested ones (Interest, Fees) use
+        their name.
+        """
+        flat = {}
+        for key, value in self.account_map.get('S2', {}).items():
+            if key in ('Interest', 'Fees'):
+                for account_type, account in (value or {}).items():
+                    flat[(key, account_type)] = account
+            else:
+                flat[('', key)] = value
+        self._s2_flat = flat
 
     def getLiquidityAccount(self, currency, source_account=None):
         """Get the liquidity account for a transaction."""
         mapped_account = self._get_mapped_s2_account('', source_account)
         if mapped_account:
-            return ":".join([mapped_account, currency])
-        
+            return _join_account(mapped_account, currency)
+
         # Fall back to default behavior
-        return ":".join([self.main_account, currency])
+        return _join_account(self.main_account, currency)
 
     def getDivIncomeAccount(self, currency, symbol):
-        return ":".join(
-            [self.main_account.replace("Assets", "Income"), symbol, self.div_suffix]
-        )
+        income_root, _ = _account_roots(self.main_account)
+        return _join_account(income_root, symbol, self.div_suffix)
 
     def getInterestIncomeAccount(self, currency, source_account=None):
         """Get the interest income account for a transaction."""
@@ -137,14 +229,11 @@ class ViacImporter(Importer):
             return mapped_account
 
         # Fall back to default behavior
-        return ":".join([
-            self.main_account.replace("Assets", "Income"),
-            self.interest_suffix,
-            currency,
-        ])
+        income_root, _ = _account_roots(self.main_account)
+        return _join_account(income_root, self.interest_suffix, currency)
 
     def getAssetAccount(self, symbol):
-        return ":".join([self.main_account, symbol])
+        return _join_account(self.main_account, symbol)
 
     def getFeesAccount(self, currency, source_account=None):
         """Get the fees account for a transaction."""
@@ -156,11 +245,8 @@ class ViacImporter(Importer):
             return mapped_account
 
         # Fall back to default behavior
-        return ":".join([
-            self.main_account.replace("Assets", "Expenses"),
-            self.fees_suffix,
-            currency,
-        ])
+        _, expenses_root = _account_roots(self.main_account)
+        return _join_account(expenses_root, self.fees_suffix, currency)
 
     def account(self, filepath):
         """The account to associate with this importer."""
@@ -168,7 +254,7 @@ class ViacImporter(Importer):
         return self.main_account or self.root_account
 
     def getDocumentUrl(self, document):
-        return f"https://app.viac.ch/files/document/{document}"
+        return _VIAC_DOC_URL + document
 
     def _get_mapped_account(self, pillar, account_type, portfolio_num=None):
         """Get the mapped account based on pillar and type"""
@@ -184,7 +270,7 @@ class ViacImporter(Importer):
 
     def fix_accounts(self, filepath):
         try:
-            pillar, portfolio = re.search(self.regex, filepath, re.IGNORECASE).groups()
+            pillar, portfolio = self._regex_re.search(filepath).groups()
         except AttributeError as e:
             logger.error(
                 f"could not extract pillar and/or portfolio from filename {filepath} with regex pattern {self.regex}."
@@ -201,10 +287,12 @@ class ViacImporter(Importer):
         
         # If no mapping found, fall back to original behavior
         if not self.main_account:
-            new_account = re.sub(r"S[2,3]a?", pillar, self.root_account)
+            new_account = _PILLAR_RE.sub(pillar, self.root_account)
             if pillar == "S2":
                 portfolio = "Freizuegigkeit"
-            self.main_account = re.sub(r"Portfolio\d|Freizuegigkeit|Ueberobligatorium", portfolio, new_account)
+            self.main_account = _PORTFOLIO_RE.sub(portfolio, new_account)
+
+        self._build_s2_flat()
 
     def extract(self, filepath, existing=None):
         # the actual processing of the json export
@@ -212,14 +300,13 @@ class ViacImporter(Importer):
         # fix Account names with regard to pillar 2/3 and different portfolios.
         self.fix_accounts(filepath)
 
-        with open(filepath) as data_file:
-            data = json.load(data_file)
-
-        transactions = data["transactions"]
         return_txn = []
 
-        # Skip transfer accounts (D1, D2)
-        for account_key in [k for k in transactions.keys() if not k.endswith(('D1', 'D2'))]:
+        for account_key, account_transactions in _iter_accounts(filepath):
+            # Skip transfer accounts (D1, D2) and accounts without transactions
+            if account_key.endswith(('D1', 'D2')) or not account_transactions:
+                continue
+
             # Store original main_account to restore after processing each account
             original_account = self.main_account
             
@@ -232,49 +319,42 @@ class ViacImporter(Importer):
                     self.main_account = self._get_mapped_account('S2', 'Ueberobligatorium') or \
                         self.main_account.replace('Freizuegigkeit', 'Ueberobligatorium')
 
-            account_transactions = transactions[account_key]
-            df = pd.json_normalize(account_transactions)
-
-            # Add source account info to dataframe
-            df['source_account'] = account_key
-
-            # convert specific columns to Decimal with specific precisions
-            to_decimal_dict = {
-                "amountInChf": 4,
-                "balanceAfterBooking": 3,
-            }
-
-            for col, digits in to_decimal_dict.items():
-                df[col] = df[col].apply(lambda x: Decimal(x).__round__(digits))
-
-            df["valueDate"] = pd.to_datetime(df["valueDate"]).apply(datetime.date)
-            df["documentNumber"] = df["documentNumber"].astype(str)
-
-            # disect the complete report in similar transactions
-            interests = df[df.type == "INTEREST"]
-            fees = df[df.type == "FEE_CHARGE"]
-            deposits = df[df.type == "CONTRIBUTION"]
-            trades = df[df.type.isin(["TRADE_SELL", "TRADE_BUY"])]
-            dividends = df[df.type.isin(["DIVIDEND", "DIVIDEND_CANCELLATION"])]
-
-            return_txn.extend(
-                self.Trades(trades)
-                + self.Interest(interests)
-                + self.Fees(fees)
-                + self.Deposits(deposits)
-                + self.Dividends(dividends)
-                + self.Balances(df)
-            )
+            # (index, row) pairs with the fields used below converted, and
+            # disected into similar transactions in the same pass
+            buckets = {bucket: [] for bucket in set(_TYPE_BUCKETS.values())}
+            latest = None  # first row on the latest value date
+            for idx, tx in enumerate(account_transactions):
+                document = tx.get("documentNumber")
+                item = (idx, {
+                    **tx,
+                    "amountInChf": Decimal(tx["amountInChf"]).quantize(_Q4),
+                    "valueDate": datetime.fromisoformat(tx["valueDate"][:10]).date(),
+                    "documentNumber": None if document is None else str(document),
+                })
+                if latest is None or item[1]["valueDate"] > latest["valueDate"]:
+                    latest = item[1]
+                bucket = _TYPE_BUCKETS.get(tx["type"])
+                if bucket is not None:
+                    buckets[bucket].append(item)
+
+            return_txn.extend(self.Trades(buckets["TRADE"], account_key))
+            return_txn.extend(self.Interest(buckets["INTEREST"], account_key))
+            return_txn.extend(self.Fees(buckets["FEE_CHARGE"], account_key))
+            return_txn.extend(self.Deposits(buckets["CONTRIBUTION"], account_key))
+            return_txn.extend(self.Dividends(buckets["DIVIDEND"], account_key))
+            return_txn.extend(self.Balances(latest, account_key))
             
             # Restore original main_account for next iteration
             self.main_account = original_account
 
         return return_txn
 
-    def Trades(self, trades):
+    def Trades(self, trades, source_account):
         bean_transactions = []
-        for idx, row in trades.iterrows():
-            currency = "CHF"
+        # all rows share the currency and source account
+        currency = "CHF"
+        liquidity_account = self.getLiquidityAccount(currency, source_account)
+        for idx, row in trades:
             asset = row["description"]
             share = self.share_lookup.get(asset)
             if share is None:
@@ -306,14 +386,12 @@ class ViacImporter(Importer):
                 data.Posting(
                     self.getAssetAccount(symbol), quantity, cost, None, None, None
                 ),
-                data.Posting(
-                    self.getLiquidityAccount(currency, row["source_account"]), proceeds, None, None, None, None
-                ),
+                data.Posting(liquidity_account, proceeds, None, None, None, None),
             ]
 
-            metadata = {"source_account": row["source_account"]}
+            metadata = {"source_account": source_account}
             document = row["documentNumber"]
-            if document != None and document != "nan":
+            if document:
                 metadata["link"] = self.getDocumentUrl(document)
 
             meta = data.new_metadata("Trade", idx, metadata)
@@ -344,32 +422,33 @@ class ViacImporter(Importer):
             )
         return bean_transactions
 
-    def Interest(self, int_):
+    def Interest(self, int_, source_account):
         # calculates interest payments from IBKR data
         bean_transactions = []
-        for idx, row in int_.iterrows():
-            currency = "CHF"
+        # all rows share the currency and source account
+        currency = "CHF"
+        interest_account = self.getInterestIncomeAccount(currency, source_account)
+        liquidity_account = self.getLiquidityAccount(currency, source_account)
+        for idx, row in int_:
             amount_ = amount.Amount(row["amountInChf"], currency)
 
             # make the postings, two for interest payments
             # received and paid interests are booked on the same account
             postings = [
                 data.Posting(
-                    self.getInterestIncomeAccount(currency, row["source_account"]),
-                    -amount_,
+                    interest_account,
+                    amount.Amount(-row["amountInChf"], currency),
                     None,
                     None,
                     None,
                     None,
                 ),
-                data.Posting(
-                    self.getLiquidityAccount(currency, row["source_account"]), amount_, None, None, None, None
-                ),
+                data.Posting(liquidity_account, amount_, None, None, None, None),
             ]
 
-            metadata = {"source_account": row["source_account"]}
+            metadata = {"source_account": source_account}
             document = row["documentNumber"]
-            if document != None and document != "nan":
+            if document:
                 metadata["link"] = self.getDocumentUrl(document)
 
             meta = data.new_metadata("Interest", idx, metadata)
@@ -388,25 +467,28 @@ class ViacImporter(Importer):
             )
         return bean_transactions
 
-    def Fees(self, fees):
+    def Fees(self, fees, source_account):
         bean_transactions = []
-        for idx, row in fees.iterrows():
-            currency = "CHF"
+        # all rows share the currency and source account
+        currency = "CHF"
+        fees_account = self.getFeesAccount(currency, source_account)
+        liquidity_account = self.getLiquidityAccount(currency, source_account)
+        for idx, row in fees:
             amount_ = amount.Amount(row["amountInChf"], currency)
 
             # make the postings, two for fees
             postings = [
                 data.Posting(
-                    self.getFeesAccount(currency, row["source_account"]), -amount_, None, None, None, None
-                ),
-                data.Posting(
-                    self.getLiquidityAccount(currency, row["source_account"]), amount_, None, None, None, None
+                    fees_account,
+                    amount.Amount(-row["amountInChf"], currency),
+                    None, None, None, None,
                 ),
+                data.Posting(liquidity_account, amount_, None, None, None, None),
             ]
 
-            metadata = {"source_account": row["source_account"]}
+            metadata = {"source_account": source_account}
             document = row["documentNumber"]
-            if document != None and document != "nan":
+            if document:
                 metadata["link"] = self.getDocumentUrl(document)
 
             meta = data.new_metadata("fee", idx, metadata)
@@ -425,25 +507,29 @@ class ViacImporter(Importer):
             )
         return bean_transactions
 
-    def Deposits(self, deposits):
+    def Deposits(self, deposits, source_account):
         bean_transactions = []
         if len(self.deposit_account) == 0:  # control this from the config file
             return []
-        for idx, row in deposits.iterrows():
-            currency = "CHF"
+        # all rows share the currency and source account
+        currency = "CHF"
+        liquidity_account = self.getLiquidityAccount(currency, source_account)
+        for idx, row in deposits:
             amount_ = amount.Amount(row["amountInChf"], currency)
 
             # make the postings. two for deposits
             postings = [
-                data.Posting(self.deposit_account, -amount_, None, None, None, None),
                 data.Posting(
-                    self.getLiquidityAccount(currency, row["source_account"]), amount_, None, None, None, None
+                    self.deposit_account,
+                    amount.Amount(-row["amountInChf"], currency),
+                    None, None, None, None,
                 ),
+                data.Posting(liquidity_account, amount_, None, None, None, None),
             ]
 
-            metadata = {"source_account": row["source_account"]}
+            metadata = {"source_account": source_account}
             document = row["documentNumber"]
-            if document != None and document != "nan":
+            if document:
                 metadata["link"] = self.getDocumentUrl(document)
 
             meta = data.new_metadata("deposit/withdrawal", idx, metadata)
@@ -462,10 +548,12 @@ class ViacImporter(Importer):
             )
         return bean_transactions
 
-    def Dividends(self, dividends):
+    def Dividends(self, dividends, source_account):
         bean_transactions = []
-        for idx, row in dividends.iterrows():
-            currency = "CHF"
+        # all rows share the currency and source account
+        currency = "CHF"
+        liquidity_account = self.getLiquidityAccount(currency, source_account)
+        for idx, row in dividends:
             share = self.share_lookup.get(row["description"])
             if share is None:
                 logger.error(
@@ -478,14 +566,14 @@ class ViacImporter(Importer):
             postings = [
                 data.Posting(
                     self.getDivIncomeAccount(currency, symbol),
-                    -amount_div,
+                    amount.Amount(-row["amountInChf"], currency),
                     None,
                     None,
                     None,
                     None,
                 ),
                 data.Posting(
-                    self.getLiquidityAccount(currency, row["source_account"]),
+                    liquidity_account,
                     amount_div,
                     None,
                     None,
@@ -496,7 +584,7 @@ class ViacImporter(Importer):
 
             metadict = {
                 "isin": share["isin"],
-                "source_account": row["source_account"]
+                "source_account": source_account
             }
 
             meta = data.new_metadata("dividend", 0, metadict)
@@ -516,19 +604,20 @@ class ViacImporter(Importer):
 
         return bean_transactions
 
-    def Balances(self, df):
+    def Balances(self, transaction, source_account):
         # generate Balance statements for every latest transaction
-        transaction = df[df["valueDate"] == df["valueDate"].max()].iloc[0]
+        # (the first one on the latest value date)
 
         currency = "CHF"
-        amount_ = amount.Amount(transaction["balanceAfterBooking"], currency)
-        meta = data.new_metadata("balance", 0, {"source_account": transaction["source_account"]})
+        balance = Decimal(transaction["balanceAfterBooking"]).quantize(_Q3)
+        amount_ = amount.Amount(balance, currency)
+        meta = data.new_metadata("balance", 0, {"source_account": source_account})
 
         return [
             data.Balance(
                 meta,
                 transaction["valueDate"] + timedelta(days=1),
-                self.getLiquidityAccount(currency, transaction["source_account"]),
+                self.getLiquidityAccount(currency, source_account),
                 amount_,
                 None,
                 None,
@@ -1,5 +1,3 @@
-import json
-import pandas as pd
 import re
 from loguru import logger
 from datetime import datetime, timedelta
@@ -9,6 +7,34 @@ from beangulp.importer import Importer
 from beancount.core.number import Decimal
 from beancount.core import data, amount
 
+from ..utils.jsonfile import load_json
+
+
+# split postings are rounded to 3 decimals, and shown with 2 where exact
+_Q2 = Decimal("0.01")
+_Q3 = Decimal("0.001")
+
+
+def _to_decimal(value):
+    # ints and numeric strings convert exactly; floats go through their
+    # shortest repr so 12.35 stays 12.35
+    if isinstance(value, (int, str)):
+        return Decimal(value)
+    return Decimal(repr(value))
+
+
+def _format_amount(amt):
+    # Format amounts to 2 decimals if they end with 0, otherwise keep 3 decimals
+    cents = amt.quantize(_Q2)
+    return cents if cents == amt else amt
+
+
+def _safe_meta_value(v):
+    # None for missing and non-finite values, which beancount cannot store
+    if isinstance(v, float) and not math.isfinite(v):
+        return None
+    return v
+
 
 class VisecaImporter(Importer):
     """
@@ -17,6 +43,7 @@ class VisecaImporter(Importer):
     def __init__(self, account="Liabilities:CreditCard:Viseca", regex=r"viseca.*\.json", category_map=None, split_expense_account=None, split_ratio=0.5):
         self.main_account = account
         self.regex = regex
+        self._regex_re = re.compile(regex, re.IGNORECASE)
         self.flag = "*"
         self.split_expense_account = split_expense_account
         self.split_ratio = Decimal(str(split_ratio))
@@ -33,7 +60,7 @@ class VisecaImporter(Importer):
         }
 
     def identify(self, filepath):
-        result = bool(re.search(self.regex, filepath, re.IGNORECASE))
+        result = bool(self._regex_re.search(filepath))
         logger.info(f"identify assertion for viseca importer and file '{filepath}': {result}")
         return result
 
@@ -43,26 +70,24 @@ class VisecaImporter(Importer):
     def extract(self, filepath, existing=None):
         logger.info(f"Starting extraction from file: {filepath}")
         entries = []
-        with open(filepath, encoding="utf-8-sig") as f:
-            data_json = json.load(f)
+        data_json = load_json(filepath)
         
         txs = data_json["list"]
-        df = pd.json_normalize(txs)
 
-        for idx, row in df.iterrows():
-            logger.debug(f"Processing transaction {idx}: {row.get('transactionId')}")
+        for idx, row in enumerate(txs):
+            logger.debug("Processing transaction {}: {}", idx, row.get("transactionId"))
             try:
                 # Category mapping
-                pfm_cat = row.get("pfmCategory.id", "other")
+                pfm_cat = (row.get("pfmCategory") or {}).get("id", "other")
                 if pfm_cat == "deposits":
                     continue  # Ignore payment transactions
 
                 # Parse date
-                date = pd.to_datetime(row["date"]).date()
+                date = datetime.fromisoformat(row["date"][:10]).date()
                 payee = row.get("prettyName") or row.get("merchantName") or "Unknown"
                 details = row.get("details", "")
                 currency = row.get("currency", "CHF")
-                amt = Decimal(str(row["amount"]))
+                amt = _to_decimal(row["amount"])
                 # Viseca: negative = refund, positive = expense
                 amt = -amt if amt < 0 else amt
         
@@ -84,24 +109,20 @@ class VisecaImporter(Importer):
                 # Expense posting(s)
                 if self.split_expense_account:
                     # Split the amount according to split_ratio and round to 3 decimal places
-                    amt_main = (amt * self.split_ratio).quantize(Decimal("0.001"))
+                    amt_main = (amt * self.split_ratio).quantize(_Q3)
                     amt_split = amt - amt_main  # Ensure total matches original
-                    
-                    # Format amounts to 2 decimals if they end with 0, otherwise keep 3 decimals
-                    def format_amount(amt):
-                        return amt.quantize(Decimal("0.01")) if amt % Decimal("0.01") == 0 else amt
-                    
+
                     postings.append(
                         data.Posting(
                             expense_account,
-                            amount.Amount(format_amount(amt_main), currency),
+                            amount.Amount(_format_amount(amt_main), currency),
                             None, None, None, None
                         )
                     )
                     postings.append(
                         data.Posting(
                             self.split_expense_account,
-                            amount.Amount(format_amount(amt_split), currency),
+                            amount.Amount(_format_amount(amt_split), currency),
                             None, None, None, None
                         )
                     )
@@ -125,27 +146,17 @@ class VisecaImporter(Importer):
                 #     )
     
                 # Build metadata dict and convert floats to strings
-                def safe_meta_value(v):
-                    if v is None:
-                        return None
-                    if isinstance(v, float):
-                        if math.isnan(v) or math.isinf(v):
-                            return None
-                    if pd.isna(v):
-                        return None
-                    return v
-
                 meta_dict = {
-                    "transactionId": safe_meta_value(row.get("transactionId")),
-                    "category": safe_meta_value(pfm_cat),
-                    "merchant": safe_meta_value(payee),
-                    "details": safe_meta_value(details),
-                    "originalAmount": str(safe_meta_value(orig_amt)) if orig_amt is not None else None,
-                    "originalCurrency": safe_meta_value(orig_cur),
+                    "transactionId": _safe_meta_value(row.get("transactionId")),
+                    "category": _safe_meta_value(pfm_cat),
+                    "merchant": _safe_meta_value(payee),
+                    "details": _safe_meta_value(details),
+                    "originalAmount": str(_safe_meta_value(orig_amt)) if orig_amt is not None else None,
+                    "originalCurrency": _safe_meta_value(orig_cur),
                 }
                 if orig_cur != "CHF":
-                    meta_dict["conversionRate"] = safe_meta_value(row.get("conversionRate"))
-                    meta_dict["conversionRateDate"] = safe_meta_value(row.get("conversionRateDate"))
+                    meta_dict["conversionRate"] = _safe_meta_value(row.get("conversionRate"))
+                    meta_dict["conversionRateDate"] = _safe_meta_value(row.get("conversionRateDate"))
                 
                 # Convert any float values to strings (for safety)
                 for k, v in meta_dict.items():
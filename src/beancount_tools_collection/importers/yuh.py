@@ -17,9 +17,55 @@ from beangulp.importer import Importer
 from beancount.core import data, amount
 from beancount.core.number import D
 from loguru import logger
-import pandas as pd
+from collections import namedtuple
+from datetime import date
+from functools import lru_cache
+from operator import itemgetter
+import csv
 import re
 
+_ZERO = D("0")
+_AMOUNT_RE = re.compile(r"-?\d+(?:\.\d*)?|-?\.\d+")
+# export columns used by the importer, in _YuhRow field order
+_COLUMNS = (
+    "DATE", "ACTIVITY TYPE", "ACTIVITY NAME", "DEBIT", "DEBIT CURRENCY",
+    "CREDIT", "CREDIT CURRENCY", "FEES/COMMISSION", "PRICE PER UNIT",
+)
+_YuhRow = namedtuple(
+    "_YuhRow",
+    "date activity_type activity_name debit debit_currency credit credit_currency fee exchange_rate",
+)
+_GOAL_TYPES = frozenset({"GOAL_DEPOSIT", "GOAL_WITHDRAWAL"})
+_RECURRING_TAGS = frozenset({"recurring"})
+_PAYMENT_TYPES = frozenset({"PAYMENT_TRANSACTION_IN", "PAYMENT_TRANSACTION_OUT"})
+_TWINT_RE = re.compile(r"twint", re.IGNORECASE)
+_SUMUP_RE = re.compile(r"sumup", re.IGNORECASE)
+_STANDING_ORDER_RE = re.compile(r"standing order|dauerauftrag", re.IGNORECASE)
+_TRANSFER_PREFIX_RE = re.compile(r"Transfer from |Transfer to |Überweisung von |Überweisung an ")
+_TWINT_PREFIX_RE = re.compile(r"Twint from |Twint to |Twint von |Twint an ")
+_SUMUP_PREFIX_RE = re.compile(r"SumUp  \*|SumUp from |SumUp to |SumUp von |SumUp an ")
+# extra info in parentheses after a goal name, e.g. "Taxes (16%)"
+_GOAL_NOTE_RE = re.compile(r"\s*\([^)]*\)")
+
+
+def _parse_date(value):
+    # Yuh writes "31/01/2024"; splitting is much cheaper than strptime
+    try:
+        day, month, year = value.split("/")
+        return date(int(year), int(month), int(day))
+    except (AttributeError, ValueError):
+        return None
+
+
+# amounts repeat a lot (empty cells, recurring payments), convert each once
+@lru_cache(maxsize=4096)
+def _to_decimal(value):
+    """Convert a value to Decimal, returning D('0') for empty/non-numeric values."""
+    str_val = value.strip()
+    if not _AMOUNT_RE.fullmatch(str_val):
+        return _ZERO
+    return D(str_val)
+
 
 class YuhImporter(Importer):
     def __init__(self, account="Assets:Cash:Yuh:Pay:CHF", 
@@ -30,9 +76,10 @@ class YuhImporter(Importer):
         self.goals_base_account = goals_base_account
         self.fees_account = fees_account
         self.regex = regex
+        self._regex_re = re.compile(regex, re.IGNORECASE)
 
     def identify(self, filepath):
-        result = bool(re.search(self.regex, filepath, re.IGNORECASE))
+        result = bool(self._regex_re.search(filepath))
         logger.info(f"identify assertion for yuh importer and file '{filepath}': {result}")
         return result
 
@@ -40,171 +87,178 @@ class YuhImporter(Importer):
         """The account to associate with this importer."""
         return self.main_account
 
-    def _to_decimal(self, val):
-        """Convert a value to Decimal, returning D('0') for empty/null values."""
-        if pd.isna(val) or val == "":
-            return D("0")
-        # Handle case where column might contain non-numeric values
-        str_val = str(val).strip()
-        if not str_val or not str_val.lstrip('-').replace('.', '', 1).isdigit():
-            return D("0")
-        return D(str_val)
-
     def _clean_payee(self, activity_name, activity_type):
         """Clean up payee name and return (payee, narration, tags)."""
         payee = str(activity_name).strip('"')
         narration = ""
-        tags = set()
+        tags = data.EMPTY_SET
+        is_payment = activity_type in _PAYMENT_TYPES
         
         # Clean up transfer payees
-        if activity_type in ["PAYMENT_TRANSACTION_IN", "PAYMENT_TRANSACTION_OUT"]:
-            payee = payee.replace("Transfer from ", "").replace("Transfer to ", "").replace("Überweisung von ", "").replace("Überweisung an ", "")
+        if is_payment:
+            payee = _TRANSFER_PREFIX_RE.sub("", payee)
         
         # Clean up Twint transactions and use title case
-        if "twint" in payee.lower():
-            payee = payee.replace("Twint from ", "").replace("Twint to ", "").replace("Twint von ", "").replace("Twint an ", "").title()
+        if _TWINT_RE.search(payee):
+            payee = _TWINT_PREFIX_RE.sub("", payee).title()
             narration = "Twint"
         
         # Clean up SumUp transactions 
-        if payee.lower().startswith("sumup"):
-            payee = payee.replace("SumUp  *", "").replace("SumUp from ", "").replace("SumUp to ", "").replace("SumUp von ", "").replace("SumUp an ", "").title()
+        if _SUMUP_RE.match(payee):
+            payee = _SUMUP_PREFIX_RE.sub("", payee).title()
             narration = "SumUp"
 
         # Clean up standing orders
-        if activity_type in ["PAYMENT_TRANSACTION_IN", "PAYMENT_TRANSACTION_OUT"] and ("standing order" in payee.lower() or "dauerauftrag" in payee.lower()):
+        if is_payment and _STANDING_ORDER_RE.search(payee):
             payee = payee.replace("Dauerauftrag an  ", "")
-            tags.add('recurring')
+            tags = _RECURRING_TAGS
 
         return payee, narration, tags
 
     def extract(self, filepath, existing=None):
         logger.info(f"Starting extraction from file: {filepath}")
-        entries = []
-        
-        # Read CSV with pandas
-        df = pd.read_csv(filepath, sep=";", encoding="utf-8-sig")
-        logger.info(f"CSV headers: {list(df.columns)}")
-        
-        # Vectorized date parsing
-        df["DATE"] = pd.to_datetime(df["DATE"], format="%d/%m/%Y", errors="coerce")
-        
-        # Convert amounts to Decimal
-        df["DEBIT"] = df["DEBIT"].apply(self._to_decimal)
-        df["CREDIT"] = df["CREDIT"].apply(self._to_decimal)
-        df["FEES/COMMISSION"] = df["FEES/COMMISSION"].apply(self._to_decimal)
-        
-        # Add absolute debit for matching
-        df["DEBIT_ABS"] = df["DEBIT"].apply(abs)
-        
-        # Keep original index for metadata
-        df["_orig_idx"] = df.index
-        
-        # Skip rows with invalid dates
-        df = df[df["DATE"].notna()]
-        
-        # Filter out reward entries
-        df = df[df["ACTIVITY TYPE"] != "REWARD_RECEIVED"]
-        
-        # Identify foreign currency transactions (non-CHF debits)
-        foreign_mask = (df["DEBIT_ABS"] > 0) & (df["DEBIT CURRENCY"] != "CHF") & (df["DEBIT CURRENCY"].notna())
-        foreign_txns = df[foreign_mask].copy()
-        
-        # Identify auto-exchange transactions
-        auto_exchange_mask = df["ACTIVITY TYPE"] == "BANK_AUTO_ORDER_EXECUTED"
-        auto_exchanges = df[auto_exchange_mask].copy()
-        
-        # Match auto-exchanges with foreign transactions using merge
-        if not auto_exchanges.empty and not foreign_txns.empty:
-            matched = auto_exchanges.merge(
-                foreign_txns[["_orig_idx", "DATE", "ACTIVITY NAME", "ACTIVITY TYPE", "DEBIT_ABS", "DEBIT CURRENCY"]],
-                left_on=["CREDIT", "CREDIT CURRENCY"],
-                right_on=["DEBIT_ABS", "DEBIT CURRENCY"],
-                suffixes=("", "_orig"),
-                how="left"
-            )
-            
-            # Track matched foreign transaction indices
-            matched_foreign_indices = set(matched["_orig_idx_orig"].dropna().astype(int))
-            matched_auto_indices = set(matched[matched["_orig_idx_orig"].notna()]["_orig_idx"].astype(int))
-        else:
-            matched = pd.DataFrame()
-            matched_foreign_indices = set()
-            matched_auto_indices = set()
-        
-        # Process matched auto-exchange transactions (combined with foreign)
-        if not matched.empty:
-            for _, row in matched[matched["_orig_idx_orig"].notna()].iterrows():
-                entry = self._create_combined_transaction(filepath, row)
+        entries = list(self._iter_entries(filepath))
+        logger.info(f"Extracted {len(entries)} entries from {filepath}")
+        return entries
+
+    def _iter_entries(self, filepath):
+        """Yield entries while reading, holding back only rows needed for exchange matching."""
+        auto_exchanges = []
+        # foreign currency debits that may still be combined with an auto-exchange
+        deferred = []
+        # foreign currency debits keyed by (absolute amount, currency)
+        foreign_by_key = {}
+        # exports repeat the same dates, parse each distinct one once
+        dates = {}
+
+        with open(filepath, encoding="utf-8-sig", newline="") as csvfile:
+            reader = csv.reader(csvfile, delimiter=";")
+            header = next(reader, None)
+            if header is None:
+                return
+            logger.info(f"CSV headers: {header}")
+
+            # positions of the used columns, an export without PRICE PER UNIT reads it as empty
+            positions = {name: i for i, name in enumerate(header)}
+            indices = [positions[name] for name in _COLUMNS[:-1]]
+            indices.append(positions.get(_COLUMNS[-1], len(header)))
+            fields = itemgetter(*indices)
+            width = max(indices) + 1
+
+            # blank lines are not rows and do not count for the row index
+            for index, row in enumerate(filter(None, reader)):
+                if len(row) < width:
+                    row.extend([""] * (width - len(row)))
+                (date_str, activity_type, activity_name, debit, debit_currency,
+                 credit, credit_currency, fee, exchange_rate) = fields(row)
+
+                row_date = dates.get(date_str)
+                if row_date is None:
+                    row_date = dates[date_str] = _parse_date(date_str) or False
+                # Skip rows with invalid dates
+                if not row_date:
+                    continue
+
+                if activity_type == "REWARD_RECEIVED":
+                    continue
+
+                debit = _to_decimal(debit)
+                row = _YuhRow(
+                    row_date, activity_type, activity_name, debit, debit_currency,
+                    _to_decimal(credit), credit_currency, _to_decimal(fee), exchange_rate,
+                )
+
+                is_foreign = bool(debit) and bool(debit_currency) and debit_currency != "CHF"
+                if is_foreign:
+                    key = (abs(debit), debit_currency)
+                    foreign_by_key.setdefault(key, []).append((index, row))
+
+                if activity_type == "BANK_AUTO_ORDER_EXECUTED":
+                    auto_exchanges.append((index, row))
+                    continue
+                if activity_type in _GOAL_TYPES:
+                    entry = self._create_goal_transaction(filepath, index, row)
+                elif is_foreign:
+                    deferred.append((index, row))
+                    continue
+                else:
+                    entry = self._create_regular_transaction(filepath, index, row)
                 if entry:
-                    entries.append(entry)
-        
-        # Process unmatched auto-exchange transactions
-        unmatched_auto = auto_exchanges[~auto_exchanges["_orig_idx"].isin(matched_auto_indices)]
-        for _, row in unmatched_auto.iterrows():
-            entry = self._create_standalone_exchange(filepath, row)
+                    yield entry
+
+        # Combine auto-exchanges with their foreign currency transactions
+        matched_foreign_indices = set()
+        for index, row in auto_exchanges:
+            matches = foreign_by_key.get((row.credit, row.credit_currency))
+            if not matches:
+                entry = self._create_standalone_exchange(filepath, index, row)
+                if entry:
+                    yield entry
+                continue
+
+            # each foreign transaction is paired with at most one auto-exchange
+            foreign_index, foreign_row = matches.pop(0)
+            matched_foreign_indices.add(foreign_index)
+            entry = self._create_combined_transaction(filepath, row, foreign_index, foreign_row)
             if entry:
-                entries.append(entry)
-        
-        # Process goal transactions
-        goals = df[df["ACTIVITY TYPE"].isin(["GOAL_DEPOSIT", "GOAL_WITHDRAWAL"])]
-        for _, row in goals.iterrows():
-            entry = self._create_goal_transaction(filepath, row)
+                yield entry
+
+        logger.info(
+            "Combined {} of {} auto-exchanges with foreign currency transactions",
+            len(matched_foreign_indices), len(auto_exchanges),
+        )
+
+        # Foreign transactions without an auto-exchange are regular transactions
+        for index, row in deferred:
+            if index in matched_foreign_indices:
+                continue
+            entry = self._create_regular_transaction(filepath, index, row)
             if entry:
-                entries.append(entry)
+                yield entry
+
+    def _exchange_meta(self, filepath, idx, row):
+        """Metadata of an auto-exchange: the original amount and the exchange rate."""
+        meta = data.new_metadata(filepath, idx)
+        meta["original-amount"] = f"{row.credit} {row.credit_currency}"
+        if row.exchange_rate.strip():
+            meta["exchange-rate"] = row.exchange_rate
+        return meta
+
+    def _exchange_postings(self, total_chf, fee, expense_chf):
+        """Postings of an auto-exchange: the CHF debit, the optional fee and the expense."""
+        postings = [
+            data.Posting(
+                self.main_account,
+                amount.Amount(-total_chf, "CHF"),
+                None, None, None, None
+            ),
+        ]
         
-        # Process regular transactions (excluding auto-exchange, goals, and matched foreign)
-        excluded_types = ["BANK_AUTO_ORDER_EXECUTED", "GOAL_DEPOSIT", "GOAL_WITHDRAWAL"]
-        regular = df[~df["ACTIVITY TYPE"].isin(excluded_types)]
-        regular = regular[~regular["_orig_idx"].isin(matched_foreign_indices)]
+        if fee > 0:
+            postings.append(data.Posting(
+                self.fees_account,
+                amount.Amount(fee, "CHF"),
+                None, None, None, None
+            ))
         
-        for _, row in regular.iterrows():
-            entry = self._create_regular_transaction(filepath, row)
-            if entry:
-                entries.append(entry)
-
-        logger.info(f"Extracted {len(entries)} entries from {filepath}")
-        return entries
+        postings.append(data.Posting(
+            "Expenses:Unknown",
+            amount.Amount(expense_chf, "CHF"),
+            None, None, None, None
+        ))
+        return postings
 
-    def _create_combined_transaction(self, filepath, row):
+    def _create_combined_transaction(self, filepath, row, orig_idx, orig_row):
         """Create a combined transaction from matched auto-exchange and foreign currency transaction."""
         try:
-            chf_debit = abs(row["DEBIT"])
-            credit_amount = row["CREDIT"]
-            credit_currency = row["CREDIT CURRENCY"]
-            fee = row["FEES/COMMISSION"]
-            exchange_rate = row.get("PRICE PER UNIT", "")
+            chf_debit = abs(row.debit)
+            fee = row.fee
+            orig_date = orig_row.date
             
-            total_chf = chf_debit
-            orig_idx = int(row["_orig_idx_orig"])
-            orig_date = row["DATE_orig"].date() if pd.notna(row["DATE_orig"]) else row["DATE"].date()
+            payee, narration, tags = self._clean_payee(orig_row.activity_name, orig_row.activity_type)
             
-            payee, narration, tags = self._clean_payee(row["ACTIVITY NAME_orig"], row["ACTIVITY TYPE_orig"])
-            
-            meta = data.new_metadata(filepath, orig_idx)
-            meta["original-amount"] = f"{credit_amount} {credit_currency}"
-            if exchange_rate and str(exchange_rate).strip():
-                meta["exchange-rate"] = str(exchange_rate)
-            
-            postings = [
-                data.Posting(
-                    self.main_account,
-                    amount.Amount(-total_chf, "CHF"),
-                    None, None, None, None
-                ),
-            ]
-            
-            if fee > 0:
-                postings.append(data.Posting(
-                    self.fees_account,
-                    amount.Amount(fee, "CHF"),
-                    None, None, None, None
-                ))
-            
-            postings.append(data.Posting(
-                "Expenses:Unknown",
-                amount.Amount(chf_debit - fee, "CHF"),
-                None, None, None, None
-            ))
+            meta = self._exchange_meta(filepath, orig_idx, row)
+            postings = self._exchange_postings(chf_debit, fee, chf_debit - fee)
             
             txn = data.Transaction(
                 meta=meta,
@@ -212,61 +266,32 @@ class YuhImporter(Importer):
                 flag="*",
                 payee=payee,
                 narration=narration,
-                tags=frozenset(tags),
+                tags=tags,
                 links=data.EMPTY_SET,
                 postings=postings,
             )
-            logger.info(f"Created combined transaction for {payee} with original amount {credit_amount} {credit_currency}")
+            logger.debug("Created combined transaction for {} with original amount {} {}", payee, row.credit, row.credit_currency)
             return txn
             
         except Exception as e:
             logger.error(f"Error creating combined transaction: {e}")
             return None
 
-    def _create_standalone_exchange(self, filepath, row):
+    def _create_standalone_exchange(self, filepath, idx, row):
         """Create a standalone exchange transaction when no matching foreign transaction found."""
         try:
-            chf_debit = abs(row["DEBIT"])
-            credit_amount = row["CREDIT"]
-            credit_currency = row["CREDIT CURRENCY"]
-            fee = row["FEES/COMMISSION"]
-            exchange_rate = row.get("PRICE PER UNIT", "")
-            
-            total_chf = chf_debit + fee
-            idx = int(row["_orig_idx"])
-            date = row["DATE"].date()
+            chf_debit = abs(row.debit)
+            fee = row.fee
+            date = row.date
             
-            meta = data.new_metadata(filepath, idx)
-            meta["original-amount"] = f"{credit_amount} {credit_currency}"
-            if exchange_rate and str(exchange_rate).strip():
-                meta["exchange-rate"] = str(exchange_rate)
-            
-            postings = [
-                data.Posting(
-                    self.main_account,
-                    amount.Amount(-total_chf, "CHF"),
-                    None, None, None, None
-                ),
-            ]
-            
-            if fee > 0:
-                postings.append(data.Posting(
-                    self.fees_account,
-                    amount.Amount(fee, "CHF"),
-                    None, None, None, None
-                ))
-            
-            postings.append(data.Posting(
-                "Expenses:Unknown",
-                amount.Amount(chf_debit, "CHF"),
-                None, None, None, None
-            ))
+            meta = self._exchange_meta(filepath, idx, row)
+            postings = self._exchange_postings(chf_debit + fee, fee, chf_debit)
             
             txn = data.Transaction(
                 meta=meta,
                 date=date,
                 flag="*",
-                payee=str(row["ACTIVITY NAME"]).strip('"'),
+                payee=str(row.activity_name).strip('"'),
                 narration="Auto-exchange",
                 tags=data.EMPTY_SET,
                 links=data.EMPTY_SET,
@@ -279,26 +304,23 @@ class YuhImporter(Importer):
             logger.error(f"Error creating standalone exchange: {e}")
             return None
 
-    def _create_goal_transaction(self, filepath, row):
+    def _create_goal_transaction(self, filepath, idx, row):
         """Create a goal deposit or withdrawal transaction."""
         try:
-            is_deposit = row["ACTIVITY TYPE"] == "GOAL_DEPOSIT"
-            goal_name = str(row["ACTIVITY NAME"]).strip('"')
-            goal_name = goal_name.replace("Deposit to «", "").replace("Withdrawal from «", "").replace("»", "")
-            goal_name = re.sub(r'\s*\([^)]*\)', '', goal_name).strip()
+            is_deposit = row.activity_type == "GOAL_DEPOSIT"
+            goal_name = str(row.activity_name).strip('"')
+            goal_name = goal_name.removeprefix("Deposit to «").removeprefix("Withdrawal from «").removesuffix("»")
+            goal_name = _GOAL_NOTE_RE.sub('', goal_name).strip()
             goal_account = f"{self.goals_base_account}:{goal_name}"
             
-            idx = int(row["_orig_idx"])
-            date = row["DATE"].date()
+            date = row.date
             
             if is_deposit:
-                amount_num = abs(row["CREDIT"])
-                currency = row["CREDIT CURRENCY"]
+                amount_num = abs(row.credit)
+                currency = row.credit_currency
             else:
-                amount_num = abs(row["DEBIT"])
-                currency = row["DEBIT CURRENCY"]
-            
-            logger.info(f"Processing {'deposit to' if is_deposit else 'withdrawal from'} goal: {goal_name}")
+                amount_num = abs(row.debit)
+                currency = row.debit_currency
             
             # For deposit: main account loses money (-), goal gains (+)
             # For withdrawal: main account gains money (+), goal loses (-)
@@ -329,24 +351,22 @@ class YuhImporter(Importer):
             logger.error(f"Error creating goal transaction: {e}")
             return None
 
-    def _create_regular_transaction(self, filepath, row):
+    def _create_regular_transaction(self, filepath, idx, row):
         """Create a regular transaction."""
         try:
-            idx = int(row["_orig_idx"])
-            date = row["DATE"].date()
+            date = row.date
             
-            if row["DEBIT"] != 0:
-                amount_num = row["DEBIT"]
-                currency = row["DEBIT CURRENCY"]
-            elif row["CREDIT"] != 0:
-                amount_num = row["CREDIT"]
-                currency = row["CREDIT CURRENCY"]
+            if row.debit != 0:
+                amount_num = row.debit
+                currency = row.debit_currency
+            elif row.credit != 0:
+                amount_num = row.credit
+                currency = row.credit_currency
             else:
-                logger.debug(f"Skipping row {idx + 1} - no amount found")
+                logger.debug("Skipping row {} - no amount found", idx + 1)
                 return None
             
-            payee, narration, tags = self._clean_payee(row["ACTIVITY NAME"], row["ACTIVITY TYPE"])
-            logger.debug(f"Processing transaction: {payee}")
+            payee, narration, tags = self._clean_payee(row.activity_name, row.activity_type)
             
             txn = data.Transaction(
                 meta=data.new_metadata(filepath, idx),
@@ -354,7 +374,7 @@ class YuhImporter(Importer):
                 flag="*",
                 payee=payee,
                 narration=narration,
-                tags=frozenset(tags),
+                tags=tags,
                 links=data.EMPTY_SET,
                 postings=[
                     data.Posting(
@@ -4,16 +4,30 @@ Price fetchers for beancount.
 This module contains price sources for automatically updating commodity prices.
 """
 
-try:
-    from . import ibkr
-except ImportError:
-    ibkr = None
+import importlib
 
-# List of available price sources
-__all__ = [name for name, module in locals().items() 
-           if module is not None and not name.startswith('_')]
+# Available price sources, imported lazily on first attribute access
+_SUBMODULES = ('ibkr',)
+
+
+def __getattr__(name):
+    if name in _SUBMODULES:
+        try:
+            module = importlib.import_module(f".{name}", __name__)
+        except ImportError:
+            module = None
+        globals()[name] = module
+        return module
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_SUBMODULES))
+
+
+__all__ = list(_SUBMODULES)
 
 SUPPORTED_SOURCES = {
     'brokers': ['ibkr'],
     'web': [],
-} 
\ No newline at end of file
+} 
@@ -0,0 +1,15 @@
+"""Date parsing for CSV exports, with strptime as the fast path."""
+
+from datetime import datetime
+
+from dateutil.parser import parse
+
+
+def parse_date(value):
+    """Parse the date of a timestamp, trying ISO-8601 before dateutil."""
+    # exports mostly start with an ISO date, e.g. 2023-01-15T00:00:00+01:00
+    # or 2023-01-05 12:34:56; fall back to dateutil for anything else
+    try:
+        return datetime.strptime(value[:10], "%Y-%m-%d").date()
+    except ValueError:
+        return parse(value).date()
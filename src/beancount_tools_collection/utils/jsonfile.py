@@ -0,0 +1,21 @@
+"""Loading of JSON exports, with orjson as an optional fast path."""
+
+import codecs
+import json
+
+try:
+    import orjson
+except ImportError:  # optional, the stdlib parser is used instead
+    orjson = None
+
+
+def load_json(filepath):
+    """Parse a JSON file, using orjson when it is installed."""
+    # read the export as bytes; orjson does not accept a UTF-8 BOM
+    with open(filepath, "rb") as data_file:
+        raw = data_file.read()
+    if orjson is None:
+        return json.loads(raw)
+    if raw.startswith(codecs.BOM_UTF8):
+        raw = raw[len(codecs.BOM_UTF8):]
+    return orjson.loads(raw)
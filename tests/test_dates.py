@@ -0,0 +1,27 @@
+"""
+Tests for the shared CSV date parser.
+
+Run with:
+    pytest tests/test_dates.py -v
+"""
+
+import pytest
+from dateutil.parser import parse
+
+from beancount_tools_collection.utils.dates import parse_date
+
+# ---------------------------------------------------------------------------
+# Tests
+# ---------------------------------------------------------------------------
+
+@pytest.mark.parametrize("value", [
+    # firefly-iii
+    "2023-01-15T00:00:00+01:00",
+    "2023-12-31",
+    # Revolut
+    "2023-01-06 11:00:00",
+    "08.01.2023 11:00",
+    "15 Jan 2023",
+])
+def test_parse_date_matches_dateutil(value):
+    assert parse_date(value) == parse(value).date()
@@ -0,0 +1,55 @@
+"""
+Offline tests for FireFlyImporter.
+
+Run with:
+    pytest tests/test_firefly_iii.py -v
+"""
+
+import datetime
+
+import pytest
+
+from beancount_tools_collection.importers.firefly_iii import FireFlyImporter
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+EXPORT = """\
+amount,currency_code,date,group_id,Description,extra
+-12.50,CHF,2023-01-15T00:00:00+01:00,1,Coffee,x
+-3.00,CHF,2023-01-16T00:00:00+01:00,2,Split A,x
+-4.00,CHF,2023-01-16T00:00:00+01:00,2 ,Split B,x
+-1.00,CHF,2023-01-17T00:00:00+01:00,abc,Bad id,x
+-1.00,CHF,2023-01-17
+"""
+
+
+class _Importer(FireFlyImporter):
+    account = "Assets:Bank"
+
+
+@pytest.fixture
+def export_file(tmp_path):
+    path = tmp_path / "firefly_export.csv"
+    path.write_text(EXPORT)
+    return str(path)
+
+
+# ---------------------------------------------------------------------------
+# Tests
+# ---------------------------------------------------------------------------
+
+def test_extract_groups_split_rows(export_file):
+    entries = _Importer().extract(export_file)
+
+    # the incomplete row and the non-numeric group id are skipped
+    assert [e.narration for e in entries] == ["Coffee", "Split A | Split B"]
+
+    coffee, split = entries
+    assert coffee.date == datetime.date(2023, 1, 15)
+    assert [str(p.units) for p in coffee.postings] == ["-12.50 CHF", "-12.50 CHF"]
+    # "2" and "2 " are one group
+    assert [str(p.units) for p in split.postings] == ["-3.00 CHF", "-3.00 CHF", "-4.00 CHF"]
+    assert all(p.account == "Assets:Bank" for p in split.postings)
+
@@ -0,0 +1,106 @@
+"""
+Offline tests for IBKRImporter.
+
+Run with:
+    pytest tests/test_ibkr.py -v
+"""
+
+import pytest
+import yaml
+from beancount import loader
+from beancount.core import data as bdata
+
+from beancount_tools_collection.importers.ibkr import IBKRImporter
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+STATEMENT = b"""<FlexQueryResponse queryName="test" type="AF">
+<FlexStatements count="1">
+<FlexStatement accountId="U123" fromDate="20240101" toDate="20251231" period="Custom" whenGenerated="20260101;120000">
+<AccountInformation accountId="U123" acctAlias="long term" currency="CHF" />
+<CorporateActions>
+<CorporateAction accountId="U123" currency="USD" symbol="MSTY.OLD" underlyingSymbol="MSTY" isin="US1" actionDescription="MSTY SPLIT 1 FOR 5 (MSTY.OLD)" dateTime="20251205;202500" reportDate="20251205" quantity="-100" type="RS" />
+<CorporateAction accountId="U123" currency="USD" symbol="MSTY" underlyingSymbol="MSTY" isin="US2" actionDescription="MSTY SPLIT 1 FOR 5 (MSTY)" dateTime="20251205;202500" reportDate="20251205" quantity="20" type="RS" />
+<CorporateAction accountId="U123" currency="USD" symbol="NVDA" underlyingSymbol="NVDA" isin="US3" actionDescription="NVDA SPLIT 10 FOR 1 (NVDA)" dateTime="20240610;202500" reportDate="20240610" quantity="90" type="FS" />
+</CorporateActions>
+</FlexStatement>
+</FlexStatements>
+</FlexQueryResponse>
+"""
+
+EXISTING = """
+2020-01-01 open Assets:Invest:IB:Long-term:MSTY
+2020-01-01 open Assets:Cash:IB:Long-term:USD
+2022-01-01 * "buy"
+  Assets:Invest:IB:Long-term:MSTY  100 MSTY {10 USD}
+  Assets:Cash:IB:Long-term:USD
+"""
+
+
+@pytest.fixture
+def config_file(tmp_path):
+    cfg = tmp_path / "ibkr.yaml"
+    cfg.write_text(yaml.dump({"token": "1", "queryId": 2}))
+    return str(cfg)
+
+
+@pytest.fixture
+def statement_file(tmp_path):
+    path = tmp_path / "statement.xml"
+    path.write_bytes(STATEMENT)
+    return str(path)
+
+
+@pytest.fixture
+def splits(config_file, statement_file):
+    existing, _, _ = loader.load_string(EXISTING)
+    entries = _importer(fpath=statement_file).extract(config_file, existing)
+    return {e.meta["symbol"]: e for e in entries if isinstance(e, bdata.Transaction)}
+
+
+def _importer(**kwargs):
+    return IBKRImporter(
+        Mainaccount="Assets:Invest:IB",
+        DivAccount="Income:Dividends:IB",
+        WHTAccount="Expenses:Taxes:IB:WHT",
+        PnLAccount="Income:PnL:IB",
+        FeesAccount="Expenses:Fees:IB",
+        stockAccountType="Invest",
+        **kwargs,
+    )
+
+
+# ---------------------------------------------------------------------------
+# Tests
+# ---------------------------------------------------------------------------
+
+def test_forward_split(splits):
+    forward = splits["NVDA"]
+    assert forward.date.isoformat() == "2024-06-10"
+    assert forward.narration == "Stock split NVDA (10:1)"
+    assert forward.meta["split_type"] == "forward"
+    assert forward.meta["split_ratio"] == "10:1"
+    assert [(p.account, str(p.units)) for p in forward.postings] == [
+        ("Assets:Invest:IB:Long-term:NVDA", "90 NVDA"),
+    ]
+
+
+def test_reverse_split(splits):
+    reverse = splits["MSTY"]
+    # the "20251205;202500" dateTime gives the action date
+    assert reverse.date.isoformat() == "2025-12-05"
+    assert reverse.meta["split_type"] == "reverse"
+    assert reverse.meta["split_ratio"] == "1:5"
+    assert [str(p.units) for p in reverse.postings] == ["-100 MSTY", "20 MSTY"]
+    # the 1000 USD cost basis carries over to the 20 new shares
+    assert str(reverse.postings[1].cost.number_per) == "50.000000"
+
+
+def test_fees_account():
+    assert _importer().getFeesAccount("USD") == "Expenses:Fees:IB:USD"
+
+    # an unconfigured fees account must not silently book to "USD"
+    with pytest.raises(TypeError):
+        _importer(FeesAccount=None).getFeesAccount("USD")
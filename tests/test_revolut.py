@@ -0,0 +1,51 @@
+"""
+Offline tests for RevolutImporter.
+
+Run with:
+    pytest tests/test_revolut.py -v
+"""
+
+import datetime
+
+import pytest
+from beancount.core import data as bdata
+
+from beancount_tools_collection.importers.revolut import RevolutImporter
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+EXPORT = """\
+Type,Product,Started Date,Completed Date,Description,Amount,Fee,Currency,State,Balance
+CARD_PAYMENT,Current,2023-01-05 10:00:00,2023-01-06 11:00:00,Coop ,-12.50,0.00,CHF,COMPLETED,1'234.50
+TOPUP,Current,2023-01-07 10:00:00,,Pending,100,0,CHF,PENDING,
+TRANSFER,Current,2023-01-08 10:00:00,2023-01-09 11:00:00,Bob,-20,0,CHF,COMPLETED,1214.50
+"""
+
+
+@pytest.fixture
+def export_file(tmp_path):
+    path = tmp_path / "revolut_chf.csv"
+    path.write_text(EXPORT, encoding="utf-8-sig")
+    return str(path)
+
+
+# ---------------------------------------------------------------------------
+# Tests
+# ---------------------------------------------------------------------------
+
+def test_extract(export_file):
+    entries = RevolutImporter([], "Assets:Revolut:CHF", "CHF").extract(export_file)
+
+    txns = [e for e in entries if isinstance(e, bdata.Transaction)]
+    # the pending row has no balance and is skipped
+    assert [(t.date, t.payee, str(t.postings[0].units)) for t in txns] == [
+        (datetime.date(2023, 1, 6), "Coop", "-12.50 CHF"),
+        (datetime.date(2023, 1, 9), "Bob", "-20 CHF"),
+    ]
+
+    balance = entries[-1]
+    assert isinstance(balance, bdata.Balance)
+    assert balance.date == datetime.date(2023, 1, 10)
+    assert str(balance.amount) == "1214.50 CHF"
@@ -0,0 +1,119 @@
+"""
+Offline tests for ViacImporter.
+
+Run with:
+    pytest tests/test_viac.py -v
+"""
+
+import codecs
+import json
+
+import pytest
+from beancount.core import data as bdata
+from beancount.parser import printer
+
+from beancount_tools_collection.importers import viac
+from beancount_tools_collection.importers.viac import ViacImporter
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+EXPORT = {
+    "transactions": {
+        "3a.1": [
+            {"type": "CONTRIBUTION", "amountInChf": 100.5, "valueDate": "2023-01-05T00:00:00",
+             "documentNumber": "D1", "description": "Einzahlung", "balanceAfterBooking": 100.5},
+            {"type": "TRADE_BUY", "amountInChf": -90.12345, "valueDate": "2023-01-06T00:00:00",
+             "documentNumber": None, "description": "CSIF World", "balanceAfterBooking": 10.38},
+            {"type": "INTEREST", "amountInChf": 0.0123, "valueDate": "2023-01-31T00:00:00",
+             "documentNumber": "I1", "description": "Zins", "balanceAfterBooking": 10.3923},
+            {"type": "FEE_CHARGE", "amountInChf": -1.5, "valueDate": "2023-01-31T00:00:00",
+             "documentNumber": "F1", "description": "Fee", "balanceAfterBooking": 8.8923},
+            {"type": "DIVIDEND", "amountInChf": 2.25, "valueDate": "2023-02-01T00:00:00",
+             "documentNumber": "V1", "description": "CSIF World", "balanceAfterBooking": 11.1423},
+        ],
+        # D1/D2 accounts are skipped by the importer
+        "3a.D1": [
+            {"type": "CONTRIBUTION", "amountInChf": 5, "valueDate": "2023-01-05T00:00:00",
+             "documentNumber": "x", "description": "x", "balanceAfterBooking": 5},
+        ],
+    }
+}
+
+
+@pytest.fixture
+def export_file(tmp_path):
+    path = tmp_path / "viac_S3a_Portfolio1.json"
+    path.write_text(json.dumps(EXPORT))
+    return str(path)
+
+
+@pytest.fixture
+def importer():
+    return ViacImporter(
+        deposit_account="Assets:Bank",
+        root_account="Assets:Vorsorge:S3a:Viac:Portfolio1",
+        share_lookup={"CSIF World": {"symbol": "CSWLD", "isin": "CH0000"}},
+    )
+
+
+def _render(entries):
+    return [(printer.format_entry(e), sorted(e.meta.items())) for e in entries]
+
+
+# ---------------------------------------------------------------------------
+# Tests
+# ---------------------------------------------------------------------------
+
+def test_extract_quantizes_float_amounts(importer, export_file):
+    entries = importer.extract(export_file)
+
+    txns = [e for e in entries if isinstance(e, bdata.Transaction)]
+    assert len(txns) == 5
+    assert all(e.meta["source_account"] == "3a.1" for e in entries)
+
+    trade = next(e for e in txns if e.date.isoformat() == "2023-01-06")
+    assert str(trade.postings[1].units) == "-90.1235 CHF"
+    # a null documentNumber must not turn into a "nan" link
+    assert "link" not in trade.meta
+
+    balance = next(e for e in entries if isinstance(e, bdata.Balance))
+    assert str(balance.amount) == "11.142 CHF"
+
+
+def _force_streaming(monkeypatch):
+    # force the ijson branch and make sure the whole-file loader is not used
+    def fail(filepath):
+        raise AssertionError("load_json called for a streamed export")
+
+    monkeypatch.setattr(viac, "_STREAM_MIN_BYTES", 0)
+    monkeypatch.setattr(viac, "load_json", fail)
+
+
+@pytest.mark.parametrize("prefix", [b"", codecs.BOM_UTF8], ids=["plain", "bom"])
+def test_streamed_and_loaded_exports_agree(importer, tmp_path, monkeypatch, prefix):
+    pytest.importorskip("ijson")
+    path = tmp_path / "viac_S3a_Portfolio1.json"
+    path.write_bytes(prefix + json.dumps(EXPORT).encode())
+
+    loaded = _render(importer.extract(str(path)))
+    _force_streaming(monkeypatch)
+    streamed = _render(importer.extract(str(path)))
+
+    assert streamed == loaded
+
+
+@pytest.mark.parametrize("streaming", [False, True], ids=["loaded", "streamed"])
+def test_export_without_transactions(importer, tmp_path, monkeypatch, streaming):
+    if streaming:
+        pytest.importorskip("ijson")
+        _force_streaming(monkeypatch)
+
+    missing = tmp_path / "viac_S3a_Portfolio1.json"
+    missing.write_text(json.dumps({"accounts": {"3a.1": []}}))
+    with pytest.raises(KeyError):
+        importer.extract(str(missing))
+
+    missing.write_text(json.dumps({"transactions": {}}))
+    assert importer.extract(str(missing)) == []
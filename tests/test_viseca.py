@@ -0,0 +1,78 @@
+"""
+Offline tests for VisecaImporter.
+
+Run with:
+    pytest tests/test_viseca.py -v
+"""
+
+import codecs
+import json
+
+import pytest
+
+from beancount_tools_collection.importers.viseca import VisecaImporter
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+EXPORT = {"list": [
+    {"transactionId": "t1", "date": "2023-03-01T10:00:00", "prettyName": "Migros",
+     "merchantName": "MIGROS", "details": "Zurich", "currency": "CHF", "amount": 12.35,
+     "pfmCategory": {"id": "groceries"}, "originalAmount": 12.35, "originalCurrency": "CHF"},
+    {"transactionId": "t2", "date": "2023-03-02T10:00:00", "prettyName": None,
+     "merchantName": "AMAZON", "details": "Online", "currency": "CHF", "amount": -5.0,
+     "pfmCategory": {"id": "shopping"}, "originalAmount": -5.5, "originalCurrency": "EUR",
+     "conversionRate": 0.91, "conversionRateDate": "2023-03-02"},
+    {"transactionId": "t3", "date": "2023-03-03T10:00:00", "prettyName": "Payment",
+     "amount": -100, "pfmCategory": {"id": "deposits"}},
+    {"transactionId": "t4", "date": "2023-03-04T10:00:00", "merchantName": "SBB",
+     "amount": 3.1, "originalCurrency": "CHF"},
+    {"transactionId": "t5", "date": "2023-03-05", "prettyName": "Bad", "amount": "abc",
+     "pfmCategory": {"id": "travel"}},
+]}
+
+
+@pytest.fixture(params=[b"", codecs.BOM_UTF8], ids=["plain", "bom"])
+def export_file(tmp_path, request):
+    path = tmp_path / "viseca_2023.json"
+    path.write_bytes(request.param + json.dumps(EXPORT).encode())
+    return str(path)
+
+
+# ---------------------------------------------------------------------------
+# Tests
+# ---------------------------------------------------------------------------
+
+def test_extract(export_file):
+    entries = VisecaImporter().extract(export_file)
+
+    # deposits and the unparsable amount are skipped
+    assert [e.meta["transactionId"] for e in entries] == ["t1", "t2", "t4"]
+    migros, amazon, sbb = entries
+
+    assert [(p.account, str(p.units)) for p in migros.postings] == [
+        ("Liabilities:CreditCard:Viseca", "-12.35 CHF"),
+        ("Expenses:Groceries", "12.35 CHF"),
+    ]
+
+    # a null prettyName falls back to the merchant name
+    assert amazon.payee == "AMAZON"
+    assert amazon.meta["originalAmount"] == "-5.5"
+    assert amazon.meta["conversionRate"] == "0.91"
+
+    # missing fields become None, not a "nan"/"None" string
+    assert sbb.meta["category"] == "other"
+    assert sbb.meta["originalAmount"] is None
+    assert sbb.postings[1].account == "Expenses:Unknown"
+
+
+def test_extract_split_expense(export_file):
+    importer = VisecaImporter(split_expense_account="Expenses:Partner", split_ratio=0.5)
+    migros = importer.extract(export_file)[0]
+
+    assert [(p.account, str(p.units)) for p in migros.postings] == [
+        ("Liabilities:CreditCard:Viseca", "-12.35 CHF"),
+        ("Expenses:Groceries", "6.175 CHF"),
+        ("Expenses:Partner", "6.175 CHF"),
+    ]
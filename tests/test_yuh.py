@@ -0,0 +1,124 @@
+"""
+Offline tests for YuhImporter.
+
+Run with:
+    pytest tests/test_yuh.py -v
+"""
+
+import pytest
+
+from beancount_tools_collection.importers.yuh import YuhImporter
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+HEADER = (
+    "DATE;ACTIVITY TYPE;ACTIVITY NAME;DEBIT;DEBIT CURRENCY;CREDIT;CREDIT CURRENCY;"
+    "CARD NUMBER;LOCALITY;RECIPIENT;SENDER;FEES/COMMISSION;BUY/SELL;QUANTITY;ASSET;"
+    "PRICE PER UNIT\n"
+)
+
+ACTIVITY = HEADER + """\
+01/03/2024;PAYMENT_TRANSACTION_IN;"Transfer from John Doe";;;1500.00;CHF;;;;John Doe;;;;;
+02/03/2024;CARD_TRANSACTION_OUT;"TWINT from anna muster";-12.00;CHF;;;;;;;;;;;
+
+03/03/2024;CARD_TRANSACTION_OUT;"SumUp  *cafe bar";-4.50;CHF;;;;;;;;;;;
+04/03/2024;PAYMENT_TRANSACTION_OUT;"Dauerauftrag an  Landlord AG standing order";-1800.00;CHF;;;;;;;;;;;
+05/03/2024;GOAL_DEPOSIT;"Deposit to «Taxes (16%)»";-200.00;CHF;200.00;CHF;;;;;;;;;
+07/03/2024;CARD_TRANSACTION_OUT;"Amazon US";-25.99;USD;;;1234;;;;;;;;
+07/03/2024;BANK_AUTO_ORDER_EXECUTED;"Auto exchange";-23.45;CHF;25.99;USD;;;;;0.12;;;;0.9023
+08/03/2024;BANK_AUTO_ORDER_EXECUTED;"Auto exchange";-10.00;CHF;11.00;EUR;;;;;0.05;;;;0.9091
+09/03/2024;REWARD_RECEIVED;"Swissqoins";;;5.0;SWQ;;;;;;;;;
+xx/yy;CARD_TRANSACTION_OUT;"Broken";-1.00;CHF;;;;;;;;;;;
+12/03/2024;CARD_TRANSACTION_OUT;"Shop";abc;CHF;;;;;;;;;;;
+"""
+
+# two identical foreign payments, but only one auto exchange to cover them
+DUPLICATES = HEADER + """\
+01/04/2024;CARD_TRANSACTION_OUT;"App Store";-5.00;USD;;;;;;;;;;;
+02/04/2024;CARD_TRANSACTION_OUT;"App Store";-5.00;USD;;;;;;;;;;;
+02/04/2024;BANK_AUTO_ORDER_EXECUTED;"Auto exchange";-4.50;CHF;5.00;USD;;;;;0.00;;;;0.9
+"""
+
+
+def _extract(tmp_path, content):
+    path = tmp_path / "yuh_activity.csv"
+    path.write_text(content, encoding="utf-8-sig")
+    return YuhImporter().extract(str(path))
+
+
+def _postings(entry):
+    return [(p.account, str(p.units)) for p in entry.postings]
+
+
+# ---------------------------------------------------------------------------
+# Tests
+# ---------------------------------------------------------------------------
+
+def test_extract(tmp_path):
+    entries = _extract(tmp_path, ACTIVITY)
+    by_payee = {e.payee: e for e in entries}
+
+    # the reward, the bad date and the bad amount produce no entries
+    assert sorted(by_payee) == [
+        "Amazon US", "Auto exchange", "Cafe Bar", "John Doe",
+        "Landlord AG standing order", "Twint From Anna Muster", "self",
+    ]
+
+    # the amount keeps the precision of the export
+    assert _postings(by_payee["John Doe"]) == [("Assets:Cash:Yuh:Pay:CHF", "1500.00 CHF")]
+    assert by_payee["Cafe Bar"].narration == "SumUp"
+    assert by_payee["Landlord AG standing order"].tags == {"recurring"}
+
+    # the goal share suffix is not part of the account name
+    goal = by_payee["self"]
+    assert goal.narration == "Deposit to Taxes"
+    assert _postings(goal) == [
+        ("Assets:Cash:Yuh:Pay:CHF", "-200.00 CHF"),
+        ("Assets:Cash:Yuh:Save:Taxes", "200.00 CHF"),
+    ]
+
+
+def test_auto_exchange_is_merged_into_payment(tmp_path):
+    entries = _extract(tmp_path, ACTIVITY)
+    by_payee = {e.payee: e for e in entries}
+
+    amazon = by_payee["Amazon US"]
+    assert amazon.meta["original-amount"] == "25.99 USD"
+    assert amazon.meta["exchange-rate"] == "0.9023"
+    assert _postings(amazon) == [
+        ("Assets:Cash:Yuh:Pay:CHF", "-23.45 CHF"),
+        ("Expenses:Fees:Yuh", "0.12 CHF"),
+        ("Expenses:Unknown", "23.33 CHF"),
+    ]
+
+    # an exchange without a matching payment is booked on its own
+    standalone = by_payee["Auto exchange"]
+    assert standalone.narration == "Auto-exchange"
+    assert _postings(standalone) == [
+        ("Assets:Cash:Yuh:Pay:CHF", "-10.05 CHF"),
+        ("Expenses:Fees:Yuh", "0.05 CHF"),
+        ("Expenses:Unknown", "10.00 CHF"),
+    ]
+
+
+def test_auto_exchange_pairs_with_one_payment(tmp_path):
+    entries = _extract(tmp_path, DUPLICATES)
+
+    assert len(entries) == 2
+    merged = [e for e in entries if "exchange-rate" in e.meta]
+    assert len(merged) == 1
+    assert _postings(merged[0]) == [
+        ("Assets:Cash:Yuh:Pay:CHF", "-4.50 CHF"),
+        ("Expenses:Unknown", "4.50 CHF"),
+    ]
+
+    # the second payment stays a plain USD row
+    plain = next(e for e in entries if e is not merged[0])
+    assert _postings(plain) == [("Assets:Cash:Yuh:Pay:CHF", "-5.00 USD")]
+
+
+@pytest.mark.parametrize("content", ["", HEADER])
+def test_extract_empty(tmp_path, content):
+    assert _extract(tmp_path, content) == []